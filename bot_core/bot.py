@@ -13,6 +13,8 @@ from bot_core.module_loader import ModuleLoader
 from middleware.cleaner_middleware import AutoDeleteCommandMiddleware
 from middleware.command_restriction_middleware import CommandRestrictionMiddleware
 from middleware.collector_middleware import CollectorMiddleware
+from middleware.composed_middleware import ComposedMessageMiddleware
+from middleware.language_middleware import LanguageMiddleware
 from middleware.logging_middleware import setup_middlewares as setup_logging_middleware
 from middleware.roleplay_middleware import RoleplayMiddleware
 from modules.filters.router import FilterService
@@ -40,8 +42,6 @@ class ModularBot:
         self.router = Router()
 
         self.command_restriction = CommandRestrictionMiddleware()
-        logging.debug("Registering CommandRestrictionMiddleware")
-        self.dp.message.middleware(self.command_restriction)
 
         self.auto_delete_storage = AutoDeleteStorage()
         self.auto_delete = AutoDeleteCommandMiddleware(
@@ -50,18 +50,28 @@ class ModularBot:
             exclude=["/autodelete", "/autodeletelist"],
         )
         logging.debug(
-            "Registering AutoDeleteCommandMiddleware with storage=%s exclude=%s",
+            "Configured AutoDeleteCommandMiddleware with storage=%s exclude=%s",
             type(self.auto_delete_storage).__name__,
             self.auto_delete.exclude,
         )
-        self.dp.message.middleware(self.auto_delete)
 
         self.collector_storage = UserStorage()
-        logging.debug("Registering CollectorMiddleware")
-        self.dp.message.middleware(CollectorMiddleware(self.collector_storage))
+        self.collector = CollectorMiddleware(self.collector_storage)
+        self.roleplay = RoleplayMiddleware()
 
-        logging.debug("Registering RoleplayMiddleware")
-        self.dp.message.middleware(RoleplayMiddleware())
+        # Registered first so every later middleware and handler gets data["language"].
+        self.dp.message.middleware(LanguageMiddleware())
+
+        # Restriction, auto-delete, collector and roleplay run in one frame per message.
+        logging.debug("Registering ComposedMessageMiddleware")
+        self.dp.message.middleware(
+            ComposedMessageMiddleware(
+                self.command_restriction,
+                self.auto_delete,
+                self.collector,
+                self.roleplay,
+            )
+        )
 
         self.nsfw_settings = NsfwSettingsStorage()
         self.nsfw_detector = NsfwDetectionService()
@@ -88,5 +98,10 @@ class ModularBot:
         await self.module_loader.load_all_modules()
 
         logging.info("Bot started successfully, entering polling loop")
-        await self.dp.start_polling(self.bot)
+        try:
+            await self.dp.start_polling(self.bot)
+        finally:
+            logging.info("Polling stopped, shutting down modules")
+            await self.module_loader.shutdown()
+            await self.collector.close()
 
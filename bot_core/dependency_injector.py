@@ -17,7 +17,12 @@ class DependencyContainer:
     def get(self, service_name: str) -> Any:
         """Get a service from the container"""
         service = self.services.get(service_name)
-        logging.debug("Resolving service '%s' -> %s", service_name, type(service).__name__ if service else None)
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(
+                "Resolving service '%s' -> %s",
+                service_name,
+                type(service).__name__ if service else None,
+            )
         return service
 
     def inject_dependencies(self, target_object: Any):
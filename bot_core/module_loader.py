@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+import asyncio
 import importlib
 import inspect
 import logging
+import os
+import sys
 from pathlib import Path
 
 from utils.path_utils import get_home_dir
@@ -13,6 +16,14 @@ from utils.path_utils import get_home_dir
 DISABLED_MODULES = {"entertaiment"}
 
 
+def _import_module(import_path: str):
+    """Return an already imported module from ``sys.modules`` or import it."""
+    module = sys.modules.get(import_path)
+    if module is None:
+        module = importlib.import_module(import_path)
+    return module
+
+
 class ModuleLoader:
     """
     Implements dynamic module loading with support for
@@ -32,50 +43,78 @@ class ModuleLoader:
 
         logging.debug("Scanning '%s' for router modules", modules_dir)
 
-        for module_path in modules_dir.glob("*/router.py"):
-            module_name = module_path.parent.name
-            if module_name in DISABLED_MODULES:
-                logging.info("Skipping disabled module '%s'", module_name)
+        module_names = []
+        with os.scandir(modules_dir) as entries:
+            for entry in entries:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                module_path = os.path.join(entry.path, "router.py")
+                if not os.path.isfile(module_path):
+                    continue
+                module_name = entry.name
+                if module_name in DISABLED_MODULES:
+                    logging.info("Skipping disabled module '%s'", module_name)
+                    continue
+                logging.debug("Discovered module candidate '%s' at '%s'", module_name, module_path)
+                module_names.append(module_name)
+
+        # Cold imports dominate startup, so import all routers concurrently in worker threads.
+        imported = await asyncio.gather(
+            *(
+                asyncio.to_thread(_import_module, f"modules.{module_name}.router")
+                for module_name in module_names
+            ),
+            return_exceptions=True,
+        )
+
+        # Resolve instances one by one, in discovery order, on the loop thread.
+        for module_name, module_spec in zip(module_names, imported):
+            module_import_path = f"modules.{module_name}.router"
+            if isinstance(module_spec, BaseException):
+                if not isinstance(module_spec, ImportError):
+                    raise module_spec
+                logging.warning(
+                    "Failed to pre-import module '%s': %s",
+                    module_name,
+                    module_spec,
+                    exc_info=module_spec,
+                )
                 continue
-            logging.debug("Discovered module candidate '%s' at '%s'", module_name, module_path)
-            try:
-                module_import_path = f"modules.{module_name}.router"
-                module_spec = importlib.import_module(module_import_path)
-                logging.debug("Imported module '%s'", module_import_path)
+            logging.debug("Imported module '%s'", module_import_path)
 
-                # default priority from legacy export
-                priority = getattr(module_spec, "priority", 100)
+            # default priority from legacy export
+            priority = getattr(module_spec, "priority", 100)
 
-                # try resolving instance to read its priority for better sorting
-                try:
-                    instance = await self._resolve_module_instance(module_spec)
-                except Exception as exc:
-                    logging.exception(
-                        "Error while resolving module instance for '%s': %s",
-                        module_name,
-                        exc,
-                    )
-                    instance = None
-                if instance is not None:
-                    priority = getattr(instance, "priority", priority)
-                    logging.debug(
-                        "Resolved module instance for '%s' with priority %s",
-                        module_name,
-                        priority,
-                    )
+            # try resolving instance to read its priority for better sorting
+            try:
+                instance = await self._resolve_module_instance(module_spec)
+            except Exception as exc:
+                logging.exception(
+                    "Error while resolving module instance for '%s': %s",
+                    module_name,
+                    exc,
+                )
+                instance = None
+            plan = None
+            if instance is not None:
+                plan = self._build_module_plan(instance)
+                priority = getattr(instance, "priority", priority)
+                logging.debug(
+                    "Resolved module instance for '%s' with priority %s",
+                    module_name,
+                    priority,
+                )
 
-                # store instance to avoid double instantiation later
-                candidates.append((priority, module_name, module_spec, instance))
-            except ImportError as e:
-                logging.exception("Failed to pre-import module '%s': %s", module_name, e)
+            # store instance to avoid double instantiation later
+            candidates.append((priority, module_name, module_spec, instance, plan))
 
         # sort by priority (lower number = higher priority)
         candidates.sort(key=lambda x: x[0])
-        logging.debug("Module load order: %s", [name for _, name, _, _ in candidates])
+        logging.debug("Module load order: %s", [name for _, name, _, _, _ in candidates])
 
         # load in priority order
-        for priority, module_name, module_spec, instance in candidates:
-            await self._include_module(module_name, module_spec, priority, instance)
+        for priority, module_name, module_spec, instance, plan in candidates:
+            await self._include_module(module_name, module_spec, priority, instance, plan)
 
     async def _resolve_module_instance(self, module_spec):
         """
@@ -141,13 +180,33 @@ class ModuleLoader:
 
         return None
 
-    async def _include_module(self, module_name: str, module_spec, priority: int, instance=None):
+    @staticmethod
+    def _build_module_plan(instance) -> dict:
+        """Resolve a module instance's lifecycle hooks once so inclusion and shutdown reuse them."""
+        register = getattr(instance, "register", None)
+        on_startup = getattr(instance, "on_startup", None)
+        on_shutdown = getattr(instance, "on_shutdown", None)
+        return {
+            "get_router": getattr(instance, "get_router", None),
+            "register": register,
+            "register_is_coro": inspect.iscoroutinefunction(register),
+            "on_startup": on_startup,
+            "on_startup_is_coro": inspect.iscoroutinefunction(on_startup),
+            "on_shutdown": on_shutdown if callable(on_shutdown) else None,
+            "on_shutdown_is_coro": inspect.iscoroutinefunction(on_shutdown),
+        }
+
+    async def _include_module(
+        self, module_name: str, module_spec, priority: int, instance=None, plan=None
+    ):
         """Include module into dispatcher, supporting both legacy and new Module API."""
         try:
             # Try Module-based first
             module_instance = (
                 instance if instance is not None else await self._resolve_module_instance(module_spec)
             )
+            if module_instance is not None and plan is None:
+                plan = self._build_module_plan(module_instance)
             logging.debug(
                 "Including module '%s' (priority=%s, instance=%s)",
                 module_name,
@@ -168,24 +227,23 @@ class ModuleLoader:
                         )
 
                 # derive router and priority
-                router = None
-                if hasattr(module_instance, "get_router"):
-                    router = module_instance.get_router()
-                elif hasattr(module_instance, "router"):
-                    router = module_instance.router
+                get_router = plan["get_router"]
+                if get_router is not None:
+                    router = get_router()
+                else:
+                    router = getattr(module_instance, "router", None)
 
                 mod_priority = getattr(module_instance, "priority", priority)
 
                 # register and include
-                if hasattr(module_instance, "register") and inspect.iscoroutinefunction(
-                    module_instance.register
-                ):
+                register = plan["register"]
+                if register is not None and plan["register_is_coro"]:
                     logging.debug("Awaiting async register() for module '%s'", module_name)
-                    await module_instance.register(self.container)
-                elif hasattr(module_instance, "register"):
+                    await register(self.container)
+                elif register is not None:
                     try:
                         logging.debug("Calling sync register() for module '%s'", module_name)
-                        module_instance.register(self.container)
+                        register(self.container)
                     except Exception as e:
                         logging.exception(
                             "Error in module.register() for '%s': %s",
@@ -197,15 +255,14 @@ class ModuleLoader:
                     self.dispatcher.include_router(router)
 
                 # call startup hook
-                if hasattr(module_instance, "on_startup") and inspect.iscoroutinefunction(
-                    module_instance.on_startup
-                ):
+                on_startup = plan["on_startup"]
+                if on_startup is not None and plan["on_startup_is_coro"]:
                     logging.debug("Awaiting async on_startup() for module '%s'", module_name)
-                    await module_instance.on_startup(self.container)
-                elif hasattr(module_instance, "on_startup"):
+                    await on_startup(self.container)
+                elif on_startup is not None:
                     try:
                         logging.debug("Calling sync on_startup() for module '%s'", module_name)
-                        module_instance.on_startup(self.container)
+                        on_startup(self.container)
                     except Exception as e:
                         logging.exception(
                             "Error in module.on_startup() for '%s': %s",
@@ -219,6 +276,7 @@ class ModuleLoader:
                         "priority": mod_priority,
                         "type": "module",
                         "instance": module_instance,
+                        "plan": plan,
                     }
                 )
                 logging.info(
@@ -256,10 +314,11 @@ class ModuleLoader:
                 instance = item.get("instance")
                 if instance is None:
                     continue
+                plan = item.get("plan") or self._build_module_plan(instance)
                 try:
-                    on_shutdown = getattr(instance, "on_shutdown", None)
-                    if callable(on_shutdown):
-                        if inspect.iscoroutinefunction(on_shutdown):
+                    on_shutdown = plan["on_shutdown"]
+                    if on_shutdown is not None:
+                        if plan["on_shutdown_is_coro"]:
                             logging.debug(
                                 "Awaiting async on_shutdown() for module '%s'",
                                 item.get("name"),
@@ -3,37 +3,38 @@
 from __future__ import annotations
 
 import os
+import re
 from pathlib import Path
 from typing import Optional
 
 
+# Every line holding an ``=``, split at the first one. Keys and values are
+# stripped afterwards and surrounding quote characters removed from values.
+_ASSIGNMENT_PATTERN = re.compile(r"^([^=\n]*)=(.*)$", re.MULTILINE)
+
+
 def find_dotenv(usecwd: bool = False, filename: str = ".env") -> str:
     """Locate the nearest .env file by walking up the directory tree."""
 
     start = Path.cwd() if usecwd else Path(__file__).resolve().parent
     for candidate in [start, *start.parents]:
-        target = candidate / filename
-        if target.exists():
-            return str(target)
+        target = os.path.join(candidate, filename)
+        if os.path.isfile(target):
+            return target
     return ""
 
 
 def load_dotenv(path: Optional[str] = None) -> bool:
     """Load key=value pairs from a .env file into the environment."""
 
-    file_path = Path(path) if path else Path(find_dotenv(usecwd=True))
-    if not file_path.exists() or not file_path.is_file():
+    file_path = path or find_dotenv(usecwd=True)
+    if not file_path or not os.path.isfile(file_path):
         return False
 
-    for line in file_path.read_text(encoding="utf-8").splitlines():
-        line = line.strip()
-        if not line or line.startswith("#"):
-            continue
-        if "=" not in line:
-            continue
-        key, value = line.split("=", 1)
+    text = Path(file_path).read_text(encoding="utf-8")
+    for key, value in _ASSIGNMENT_PATTERN.findall(text):
         key = key.strip()
-        value = value.strip().strip("'\"")
-        os.environ.setdefault(key, value)
+        if key.startswith("#"):
+            continue
+        os.environ.setdefault(key, value.strip().strip("'\""))
     return True
-
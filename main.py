@@ -2,20 +2,26 @@
 
 from __future__ import annotations
 
+import argparse
 import asyncio
 import logging
+import sys
 from contextlib import suppress
 from pathlib import Path
+from typing import Any, Coroutine, Optional, Sequence
 
 import faulthandler
 
+try:  # pragma: no cover - optional dependency
+    import uvloop
+except ImportError:  # pragma: no cover - optional dependency
+    uvloop = None
+
 from bot_core.bot import ModularBot
 from utils import path_utils
 from utils.config import BotSettings, load_settings
 from utils.logging_utils import configure_logging
 
-faulthandler.enable()
-
 
 async def main(settings: BotSettings) -> None:
     """Start the bot using the provided settings."""
@@ -29,27 +35,54 @@ async def main(settings: BotSettings) -> None:
     await bot.start()
 
 
+def _run(coro: Coroutine[Any, Any, None]) -> None:
+    """Run the coroutine on uvloop when it is installed, otherwise on the default loop."""
+
+    if uvloop is None or sys.platform == "win32":
+        asyncio.run(coro)
+    elif sys.version_info >= (3, 12):
+        asyncio.run(coro, loop_factory=uvloop.new_event_loop)
+    else:
+        uvloop.install()
+        asyncio.run(coro)
+
+
+def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run CoolPugBot.")
+    parser.add_argument(
+        "--no-faulthandler",
+        action="store_true",
+        help="Do not install the faulthandler crash handlers (overrides FAULTHANDLER).",
+    )
+    return parser.parse_args(argv)
+
+
 def _bootstrap() -> None:
     """Load configuration, configure logging and start the asyncio loop."""
 
+    args = _parse_args()
     project_root = Path(__file__).parent
     settings = load_settings()
+    if settings.faulthandler and not args.no_faulthandler:
+        faulthandler.enable()
 
     log_dir = project_root / "logs"
-    configure_logging(log_dir, level=settings.log_level)
+    log_listener = configure_logging(log_dir, level=settings.log_level)
 
     logger = logging.getLogger(__name__)
     logger.info("CoolPugBot starting up")
     try:
-        asyncio.run(main(settings))
+        _run(main(settings))
     except KeyboardInterrupt:
         logger.info("CoolPugBot interrupted by user")
     except Exception:  # pragma: no cover - safety net
         logger.exception("CoolPugBot stopped due to an unexpected error")
         raise
     finally:
-        # Ensure logging handlers flush buffers before the interpreter exits.
-        for handler in logging.getLogger().handlers:
+        # Drain the logging queue and flush handlers before the interpreter exits.
+        with suppress(Exception):
+            log_listener.stop()
+        for handler in log_listener.handlers:
             with suppress(Exception):
                 handler.flush()
 
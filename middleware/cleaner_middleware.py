@@ -1,32 +1,52 @@
 import asyncio
+import heapq
 import logging
-from typing import Callable, Dict, Awaitable, Any, List, Optional
+import re
+from typing import Callable, Dict, Awaitable, Any, List, Optional, Set, Tuple
 
-from aiogram import BaseMiddleware
+from aiogram import BaseMiddleware, Bot
 from aiogram.types import TelegramObject, Message
 
 from modules.autodelete.storage import AutoDeleteStorage
 
 
+logger = logging.getLogger(__name__)
+
+
 class AutoDeleteCommandMiddleware(BaseMiddleware):
     """
     Middleware that automatically deletes command messages after specified delay.
-    Demonstrates async task scheduling and message management.
+    Deadlines live in a single min-heap served by one background task, and due
+    messages are flushed per chat through the bulk ``deleteMessages`` endpoint
+    instead of one request per message.
     """
 
+    # Bot API limit for a single deleteMessages call.
+    BULK_DELETE_LIMIT = 100
+
+    # Leading "/command" token, stopping at whitespace or a "@botname" suffix.
+    COMMAND_PATTERN = re.compile(r"/[^\s@]*")
+
     def __init__(
         self,
         delay_seconds: int = 2,
         delete_commands_only: bool = True,
         storage: Optional[AutoDeleteStorage] = None,
         exclude: Optional[List[str]] = None,
+        max_concurrent_deletes: int = 5,
     ):
         self.delay_seconds = delay_seconds
         self.delete_commands_only = delete_commands_only
-        self.deletion_tasks = []  # Track active deletion tasks
+        self.deletion_tasks: Set[asyncio.Task] = set()  # Track active flush tasks
+        # (deadline, chat_id, message_id) ordered by deadline
+        self._deadlines: List[Tuple[float, int, int]] = []
+        self._bot: Optional[Bot] = None
+        self._wakeup = asyncio.Event()
+        self._timer_task: Optional[asyncio.Task] = None
+        self._delete_semaphore = asyncio.Semaphore(max_concurrent_deletes)
         self.storage = storage
-        self.exclude = [self._normalise_command(cmd) for cmd in (exclude or [])]
-        logging.debug(
+        self.exclude = frozenset(self._normalise_command(cmd) for cmd in (exclude or []))
+        logger.debug(
             "AutoDeleteCommandMiddleware configured: delay=%s delete_commands_only=%s exclude=%s",
             self.delay_seconds,
             self.delete_commands_only,
@@ -41,85 +61,127 @@ class AutoDeleteCommandMiddleware(BaseMiddleware):
     ) -> Any:
 
         # Execute handler first
-        logging.debug(
-            "AutoDelete middleware received event=%s handler=%s", type(event).__name__, getattr(handler, "__name__", handler)
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "AutoDelete middleware received event=%s handler=%s",
+                type(event).__name__,
+                getattr(handler, "__name__", handler),
+            )
         result = await handler(event, data)
 
-        # Check if we should delete this message
-        if isinstance(event, Message) and self._should_delete_message(event):
-            # Schedule deletion after delay
-            logging.debug(
-                "Scheduling auto deletion for message_id=%s delay=%s", event.message_id, self.delay_seconds
-            )
-            task = asyncio.create_task(
-                self._delete_after_delay(event, self.delay_seconds)
-            )
-            self.deletion_tasks.append(task)
-            # cleanup finished tasks to avoid memory leak
-            self.deletion_tasks = [t for t in self.deletion_tasks if not t.done()]
+        if isinstance(event, Message):
+            self._process(event, data)
 
         return result
 
-    def _should_delete_message(self, message: Message) -> bool:
-        if not message.text:
-            logging.debug("Message %s has no text; skipping auto delete", message.message_id)
+    def _process(self, event: Message, data: Dict[str, Any]) -> None:
+        """Schedule deletion of a handled message when auto-delete applies to it."""
+        message_id = event.message_id
+        chat_id = event.chat.id
+        if not self._should_delete_message(event.text, chat_id, message_id):
+            return
+        # Schedule deletion after delay
+        logger.debug(
+            "Scheduling auto deletion for message_id=%s delay=%s", message_id, self.delay_seconds
+        )
+        bot = data.get("bot") or event.bot
+        if bot is not None:
+            self._schedule_deletion(bot, chat_id, message_id)
+
+    def _should_delete_message(self, text: Optional[str], chat_id: int, message_id: int) -> bool:
+        if not text or text[0] != "/":
+            logger.debug("Message %s is not a command; skipping auto delete", message_id)
             return False
 
-        command = self._extract_command(message.text)
+        command = self._extract_command(text)
         if not command:
-            logging.debug("Message %s has no recognised command; skipping auto delete", message.message_id)
+            logger.debug("Message %s has no recognised command; skipping auto delete", message_id)
             return False
 
-        if any(self._matches_command(message.text, cmd) for cmd in self.exclude):
-            logging.debug("Message %s matches exclude list; skipping auto delete", message.message_id)
+        if command in self.exclude:
+            logger.debug("Message %s matches exclude list; skipping auto delete", message_id)
             return False
 
         if self.storage:
-            should_delete = self.storage.is_enabled(message.chat.id, command)
-            logging.debug(
+            should_delete = self.storage.is_enabled(chat_id, command)
+            logger.debug(
                 "Auto delete check for chat=%s command=%s -> %s",
-                message.chat.id,
+                chat_id,
                 command,
                 should_delete,
             )
             return should_delete
 
         should_delete = True
-        logging.debug("Message %s auto delete default decision: %s", message.message_id, should_delete)
+        logger.debug("Message %s auto delete default decision: %s", message_id, should_delete)
         return should_delete
 
-    @staticmethod
-    def _matches_command(text: str, command: str) -> bool:
-        if not text.startswith(command):
-            return False
-        remainder = text[len(command):]
-        return remainder == "" or remainder.startswith(" ") or remainder.startswith("@")
-
     @staticmethod
     def _normalise_command(command: str) -> str:
         command = command.strip()
         if not command.startswith("/"):
             return command
-        if "@" in command:
-            command = command.split("@", 1)[0]
-        return command.lower()
+        return command.partition("@")[0].lower()
 
     def _extract_command(self, text: str) -> Optional[str]:
-        if not text.startswith("/"):
+        match = self.COMMAND_PATTERN.match(text)
+        if match is None:
             return None
-        first_part = text.split(maxsplit=1)[0]
-        command = first_part.split("@", 1)[0]
-        if self.delete_commands_only:
-            return command.lower()
-        return command.lower()
-
-    async def _delete_after_delay(self, message: Message, delay: int):
-        """Delete message after specified delay"""
-        try:
-            await asyncio.sleep(delay)
-            await message.delete()
-            logging.info("Auto-deleted message: %s", message.message_id)
-        except Exception as e:
-            # Handle deletion errors (message might be already deleted)
-            logging.warning("Failed to delete message %s: %s", message.message_id, e)
+        return match.group(0).lower()
+
+    def _schedule_deletion(self, bot: Bot, chat_id: int, message_id: int) -> None:
+        deadline = asyncio.get_running_loop().time() + self.delay_seconds
+        self._bot = bot
+        deadlines = self._deadlines
+        heapq.heappush(deadlines, (deadline, chat_id, message_id))
+        if deadlines[0][2] == message_id and deadlines[0][1] == chat_id:
+            # New earliest deadline: let the timer re-evaluate its sleep.
+            self._wakeup.set()
+        if self._timer_task is None or self._timer_task.done():
+            self._timer_task = asyncio.create_task(self._run_timer())
+
+    async def _run_timer(self) -> None:
+        """Sleep until the earliest deadline and flush everything that is due."""
+        loop = asyncio.get_running_loop()
+        deadlines = self._deadlines
+        while True:
+            self._wakeup.clear()
+            if not deadlines:
+                await self._wakeup.wait()
+                continue
+
+            timeout = deadlines[0][0] - loop.time()
+            if timeout > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            now = loop.time()
+            due: Dict[int, List[int]] = {}
+            while deadlines and deadlines[0][0] <= now:
+                _, chat_id, message_id = heapq.heappop(deadlines)
+                due.setdefault(chat_id, []).append(message_id)
+
+            for chat_id, message_ids in due.items():
+                task = asyncio.create_task(self._flush_chat(self._bot, chat_id, message_ids))
+                self.deletion_tasks.add(task)
+                # finished tasks drop themselves so the set never needs a scan
+                task.add_done_callback(self.deletion_tasks.discard)
+
+    async def _flush_chat(self, bot: Bot, chat_id: int, message_ids: List[int]) -> None:
+        """Delete the given messages of one chat in bulk-sized chunks."""
+        # The same message can be scheduled once per matched handler.
+        message_ids = list(dict.fromkeys(message_ids))
+        for start in range(0, len(message_ids), self.BULK_DELETE_LIMIT):
+            chunk = message_ids[start:start + self.BULK_DELETE_LIMIT]
+            async with self._delete_semaphore:
+                try:
+                    await bot.delete_messages(chat_id=chat_id, message_ids=chunk)
+                    logger.info("Auto-deleted messages %s in chat %s", chunk, chat_id)
+                except Exception as e:
+                    # Handle deletion errors (messages might be already deleted)
+                    logger.warning(
+                        "Failed to delete messages %s in chat %s: %s", chunk, chat_id, e
+                    )
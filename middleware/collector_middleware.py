@@ -1,19 +1,39 @@
+import asyncio
+import contextlib
 import logging
-from typing import Any, Awaitable, Callable, Dict
+from typing import Any, Awaitable, Callable, Dict, Optional
 
 from aiogram import BaseMiddleware
 from aiogram.types import Message, TelegramObject
 
-from modules.collector.storage import UserStorage
+from modules.collector.storage import MessageActivity, UserStorage
 from modules.collector.utils import UserCollector
 
 
+logger = logging.getLogger(__name__)
+
+
 class CollectorMiddleware(BaseMiddleware):
+    """
+    Records message activity without blocking the handler chain.
+
+    Activities are queued and written in batches by a single background task
+    running the storage calls in a worker thread.
+    """
+
+    QUEUE_SIZE = 1024
+    BATCH_SIZE = 128
+
     def __init__(self, storage: UserStorage):
         super().__init__()
         self.storage = storage
         UserCollector.storage = storage
-        logging.debug("CollectorMiddleware initialised with storage=%s", type(storage).__name__)
+        self._record_activities = UserCollector.record_activities
+        self._queue: asyncio.Queue[MessageActivity] = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        self._drain_task: Optional[asyncio.Task] = None
+        # Batch currently being written in a worker thread, if any.
+        self._write: Optional[asyncio.Future] = None
+        logger.debug("CollectorMiddleware initialised with storage=%s", type(storage).__name__)
 
     async def __call__(
         self,
@@ -21,33 +41,87 @@ class CollectorMiddleware(BaseMiddleware):
         event: TelegramObject,
         data: Dict[str, Any]
     ) -> Any:
-        logging.debug("CollectorMiddleware intercepted event=%s", type(event).__name__)
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        if debug_enabled:
+            logger.debug("CollectorMiddleware intercepted event=%s", type(event).__name__)
 
         # Логика: если это сообщение от юзера → сохранить
         if isinstance(event, Message):
-            chat_id = getattr(event.chat, "id", None)
-            if event.from_user:
-                logging.debug(
-                    "Recording collector data for message_id=%s chat_id=%s user_id=%s",
-                    getattr(event, "message_id", None),
+            self._process(event)
+
+        # Передаём управление дальше (команды и хэндлеры будут работать)
+        result = await handler(event, data)
+        if debug_enabled:
+            logger.debug("CollectorMiddleware finished processing event=%s", type(event).__name__)
+        return result
+
+    def _process(self, event: Message) -> None:
+        """Record the sender's activity for the message."""
+        chat_id = getattr(event.chat, "id", None)
+        user = event.from_user
+        if user:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Queueing collector data for message_id=%s chat_id=%s user_id=%s",
+                    event.message_id,
                     chat_id,
-                    event.from_user.id,
+                    user.id,
                 )
-                UserCollector.record_activity(
+            self._enqueue(
+                MessageActivity(
                     chat_id=chat_id,
-                    user_id=event.from_user.id,
-                    username=event.from_user.username,
-                    display_name=event.from_user.full_name,
-                    occurred_at=getattr(event, "date", None),
-                )
-            else:
-                logging.debug(
-                    "Message %s has no from_user to record",
-                    getattr(event, "message_id", None),
+                    user_id=user.id,
+                    username=user.username,
+                    display_name=user.full_name,
+                    occurred_at=event.date,
                 )
+            )
+        elif logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Message %s has no from_user to record", event.message_id)
 
-        # Передаём управление дальше (команды и хэндлеры будут работать)
-        result = await handler(event, data)
-        logging.debug("CollectorMiddleware finished processing event=%s", type(event).__name__)
-        return result
+    def _enqueue(self, activity: MessageActivity) -> None:
+        queue = self._queue
+        if queue.full():
+            # Drop the oldest pending record rather than stall message handling.
+            queue.get_nowait()
+            logger.warning("Collector queue is full; dropping the oldest activity record")
+        queue.put_nowait(activity)
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = asyncio.create_task(self._drain())
+
+    async def _drain(self) -> None:
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+            write = asyncio.ensure_future(asyncio.to_thread(self._record_activities, batch))
+            self._write = write
+            try:
+                # Shielded so that close() can still wait for it after cancelling.
+                await asyncio.shield(write)
+            except Exception:
+                logger.exception("Failed to record %s collector activities", len(batch))
+            self._write = None
 
+    async def close(self) -> None:
+        """Stop the background writer and record everything still queued."""
+        if self._drain_task is not None:
+            self._drain_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._drain_task
+            self._drain_task = None
+        if self._write is not None:
+            try:
+                await self._write
+            except Exception:
+                logger.exception("Failed to record in-flight collector activities")
+            self._write = None
+        pending = []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        if pending:
+            try:
+                await asyncio.to_thread(self._record_activities, pending)
+            except Exception:
+                logger.exception("Failed to record %s pending collector activities", len(pending))
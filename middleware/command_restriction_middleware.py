@@ -1,21 +1,42 @@
 import logging
+import re
 from typing import Any, Awaitable, Callable, Dict, Optional
 
 from aiogram import BaseMiddleware
 from aiogram.types import Message, TelegramObject
 
-from modules.moderation.command_restrictions import (
-    _normalise_command_name,
-    command_restrictions,
-)
+from modules.moderation.command_restrictions import command_restrictions
 from modules.moderation.level_storage import moderation_levels
 from modules.moderation.rank_storage import moderator_ranks
 from utils.localization import gettext, language_from_message
+from utils.ttl_cache import TTLCache
 
 
 class CommandRestrictionMiddleware(BaseMiddleware):
+    # Chat member statuses rarely change, so a restricted command burst only
+    # needs one get_chat_member round-trip per user per minute.
+    MEMBER_STATUS_TTL = 60
+    MEMBER_STATUS_CACHE_SIZE = 10_000
+    # Effective levels are reused only within a short burst of commands.
+    EFFECTIVE_LEVEL_TTL = 1
+
+    # Command name after the leading "/", without any "@botname" suffix.
+    COMMAND_PATTERN = re.compile(r"/([^\s@]*)")
+
     def __init__(self) -> None:
         super().__init__()
+        # Bound once so the per-message path skips the storage attribute lookups.
+        self._get_command_priority = command_restrictions.get_command_priority
+        self._get_effective_level = moderation_levels.get_effective_level
+        self._ensure_rank_for_level = moderator_ranks.ensure_rank_for_level
+        self._member_status_cache: TTLCache[tuple[int, int], str] = TTLCache(
+            self.MEMBER_STATUS_TTL, self.MEMBER_STATUS_CACHE_SIZE
+        )
+        # language -> unformatted denial message
+        self._denied_templates: Dict[str, str] = {}
+        self._effective_level_cache: TTLCache[tuple[int, int, Optional[str]], int] = TTLCache(
+            self.EFFECTIVE_LEVEL_TTL, self.MEMBER_STATUS_CACHE_SIZE
+        )
         logging.debug("CommandRestrictionMiddleware initialised")
 
     async def __call__(
@@ -24,52 +45,83 @@ class CommandRestrictionMiddleware(BaseMiddleware):
         event: TelegramObject,
         data: Dict[str, Any],
     ) -> Any:
-        if isinstance(event, Message):
-            command_name = self._extract_command_name(event.text or event.caption)
-            if command_name and event.chat and event.from_user:
-                required_priority = command_restrictions.get_command_priority(
-                    event.chat.id, command_name
-                )
-                if required_priority is not None:
-                    status = None
-                    bot = data.get("bot")
-                    if bot is not None:
-                        try:
-                            member = await bot.get_chat_member(
-                                event.chat.id, event.from_user.id
-                            )
-                            status = getattr(member, "status", None)
-                        except Exception as exc:
-                            logging.debug(
-                                "Failed to fetch chat member for command restriction: %s",
-                                exc,
-                            )
-                    user_level = moderation_levels.get_effective_level(
-                        event.chat.id,
-                        event.from_user.id,
-                        status=status,
-                    )
-                    user_priority = moderator_ranks.ensure_rank_for_level(
-                        event.chat.id, user_level
-                    ).priority
-
-                    if user_priority < required_priority:
-                        language = language_from_message(event)
-                        reply_text = gettext(
-                            "moderation.command_restrict.denied",
-                            language=language,
-                            default="❌ Only level {level}+ members can use {command}.",
-                            level=required_priority,
-                            command=f"/{command_name}",
-                        )
-                        await event.answer(reply_text, parse_mode=None)
-                        return None
+        if isinstance(event, Message) and not await self._process(event, data):
+            return None
         return await handler(event, data)
 
-    @staticmethod
-    def _extract_command_name(text: Optional[str]) -> Optional[str]:
-        if not text or not text.startswith("/"):
+    async def _process(self, event: Message, data: Dict[str, Any]) -> bool:
+        """Return ``False`` after answering when the sender may not run the command."""
+        text = event.text or event.caption
+        chat = event.chat
+        user = event.from_user
+        # Most messages are not commands; skip them before any parsing.
+        if not (text and text[0] == "/" and chat and user):
+            return True
+
+        command_name = self._extract_command_name(text)
+        if not command_name:
+            return True
+
+        chat_id = chat.id
+        required_priority = self._get_command_priority(chat_id, command_name)
+        if required_priority is None:
+            return True
+
+        user_id = user.id
+        status = await self._get_member_status(data.get("bot"), chat_id, user_id)
+        level_key = (chat_id, user_id, status)
+        user_level = self._effective_level_cache.get(level_key)
+        if user_level is None:
+            user_level = self._get_effective_level(chat_id, user_id, status=status)
+            self._effective_level_cache.set(level_key, user_level)
+        user_priority = self._ensure_rank_for_level(chat_id, user_level).priority
+
+        if user_priority < required_priority:
+            language = data.get("language") or language_from_message(event)
+            template = self._denied_template(language)
+            try:
+                reply_text = template.format(level=required_priority, command=f"/{command_name}")
+            except (KeyError, IndexError, ValueError):
+                logging.exception("Failed to format command restriction denial template")
+                reply_text = template
+            await event.answer(reply_text, parse_mode=None)
+            return False
+        return True
+
+    def _denied_template(self, language: str) -> str:
+        template = self._denied_templates.get(language)
+        if template is None:
+            template = gettext(
+                "moderation.command_restrict.denied",
+                language=language,
+                default="❌ Only level {level}+ members can use {command}.",
+            )
+            self._denied_templates[language] = template
+        return template
+
+    async def _get_member_status(self, bot, chat_id: int, user_id: int) -> Optional[str]:
+        key = (chat_id, user_id)
+        status = self._member_status_cache.get(key)
+        if status is not None or bot is None:
+            return status
+        try:
+            member = await bot.get_chat_member(chat_id, user_id)
+        except Exception as exc:
+            logging.debug(
+                "Failed to fetch chat member for command restriction: %s",
+                exc,
+            )
+            return None
+        status = getattr(member, "status", None)
+        if status is not None:
+            self._member_status_cache.set(key, status)
+        return status
+
+    @classmethod
+    def _extract_command_name(cls, text: Optional[str]) -> Optional[str]:
+        if not text:
+            return None
+        match = cls.COMMAND_PATTERN.match(text)
+        if match is None:
             return None
-        first_part = text.split(maxsplit=1)[0]
-        name = _normalise_command_name(first_part)
-        return name or None
+        return match.group(1).lower() or None
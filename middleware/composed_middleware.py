@@ -0,0 +1,55 @@
+import logging
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import Message, TelegramObject
+
+from middleware.cleaner_middleware import AutoDeleteCommandMiddleware
+from middleware.collector_middleware import CollectorMiddleware
+from middleware.command_restriction_middleware import CommandRestrictionMiddleware
+from middleware.roleplay_middleware import RoleplayMiddleware
+
+
+class ComposedMessageMiddleware(BaseMiddleware):
+    """
+    Runs the always-on message middlewares inside a single coroutine frame.
+
+    The order matches registering them one by one: command restriction,
+    auto-delete (after the handler), collector, then inline roleplay.
+    """
+
+    def __init__(
+        self,
+        command_restriction: CommandRestrictionMiddleware,
+        auto_delete: AutoDeleteCommandMiddleware,
+        collector: CollectorMiddleware,
+        roleplay: RoleplayMiddleware,
+    ) -> None:
+        super().__init__()
+        self.command_restriction = command_restriction
+        self.auto_delete = auto_delete
+        self.collector = collector
+        self.roleplay = roleplay
+        logging.debug("ComposedMessageMiddleware initialised")
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        if not isinstance(event, Message):
+            return await handler(event, data)
+
+        if not await self.command_restriction._process(event, data):
+            return None
+
+        self.collector._process(event)
+
+        if await self.roleplay._process(event):
+            result = None
+        else:
+            result = await handler(event, data)
+
+        self.auto_delete._process(event, data)
+        return result
@@ -0,0 +1,28 @@
+"""Resolve the reply language once per message update."""
+
+from __future__ import annotations
+
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import Message, TelegramObject
+
+from utils.localization import language_from_message
+
+
+class LanguageMiddleware(BaseMiddleware):
+    """Store the message language in ``data["language"]``.
+
+    Handlers and later middlewares receive it as a ``language`` argument
+    instead of calling ``language_from_message`` again.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        if isinstance(event, Message):
+            data["language"] = language_from_message(event)
+        return await handler(event, data)
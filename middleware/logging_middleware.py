@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import logging
 from typing import Any, Awaitable, Callable, Dict
 
@@ -11,7 +12,23 @@ from aiogram.types import Message, TelegramObject
 
 
 class LoggingMiddleware(BaseMiddleware):
-    """Log incoming updates and handler outcomes with structured metadata."""
+    """Log incoming updates and handler outcomes with structured metadata.
+
+    The structured ``extra`` payloads are only built when the logger would
+    actually emit the record.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._log = logging.getLogger("middleware.logging")
+
+    @staticmethod
+    def _handler_name(handler: Callable[..., Any]) -> str:
+        # aiogram rebuilds the chain for every update as partial(next_middleware, ...);
+        # name the middleware instead of repr()-ing the whole nested partial.
+        if isinstance(handler, functools.partial):
+            return type(handler.func).__qualname__
+        return getattr(handler, "__qualname__", None) or repr(handler)
 
     async def __call__(
         self,
@@ -19,39 +36,36 @@ class LoggingMiddleware(BaseMiddleware):
         event: TelegramObject,
         data: Dict[str, Any],
     ) -> Any:
-        logger = logging.getLogger("middleware.logging")
+        logger = self._log
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
         if isinstance(event, Message):
-            logger.info(
-                "incoming message",
-                extra={
-                    "chat_id": getattr(event.chat, "id", None),
-                    "chat_type": getattr(event.chat, "type", None),
-                    "user_id": getattr(event.from_user, "id", None),
-                    "username": getattr(event.from_user, "username", None),
-                    "text": event.text or event.caption,
-                },
-            )
-        else:
+            if logger.isEnabledFor(logging.INFO):
+                chat = event.chat
+                user = event.from_user
+                logger.info(
+                    "incoming message",
+                    extra={
+                        "chat_id": chat.id if chat else None,
+                        "chat_type": chat.type if chat else None,
+                        "user_id": user.id if user else None,
+                        "username": user.username if user else None,
+                        "text": event.text or event.caption,
+                    },
+                )
+        elif debug_enabled:
             logger.debug("incoming update", extra={"type": type(event).__name__})
 
         try:
             result = await handler(event, data)
-            logger.debug(
-                "handler completed",
-                extra={
-                    "type": type(event).__name__,
-                    "handler": getattr(handler, "__qualname__", repr(handler)),
-                },
-            )
-            return result
         except SkipHandler:
-            logger.debug(
-                "handler skipped",
-                extra={
-                    "type": type(event).__name__,
-                    "handler": getattr(handler, "__qualname__", repr(handler)),
-                },
-            )
+            if debug_enabled:
+                logger.debug(
+                    "handler skipped",
+                    extra={
+                        "type": type(event).__name__,
+                        "handler": self._handler_name(handler),
+                    },
+                )
             raise
         except Exception:
             logger.exception(
@@ -60,6 +74,16 @@ class LoggingMiddleware(BaseMiddleware):
             )
             raise
 
+        if debug_enabled:
+            logger.debug(
+                "handler completed",
+                extra={
+                    "type": type(event).__name__,
+                    "handler": self._handler_name(handler),
+                },
+            )
+        return result
+
 
 def setup_middlewares(dispatcher, _container) -> None:
     """Register the logging middleware on the dispatcher."""
@@ -7,6 +7,7 @@ from aiogram.types import Message, TelegramObject, User
 
 from modules.collector.utils import UserCollector
 from modules.roleplay.router import (
+    KEYWORD_PUNCTUATION,
     _escape_html,
     _get_display_name,
     build_action_text,
@@ -15,9 +16,21 @@ from modules.roleplay.router import (
 )
 
 
+# "@username" mention inside the text following an RP command.
+_USERNAME_RE = re.compile(r"@([A-Za-z0-9_]{1,32})")
+
+
 class RoleplayMiddleware(BaseMiddleware):
     """Middleware that handles inline RP commands when replying or mentioning."""
 
+    # Media types sent with the RP text as caption, mapped to the reply method.
+    _MEDIA_DISPATCH = {
+        "photo": "reply_photo",
+        "animation": "reply_animation",
+        "video": "reply_video",
+    }
+    _REPLY_KWARGS = {"parse_mode": "HTML", "disable_web_page_preview": True}
+
     def __init__(self, config=None):
         super().__init__()
         self.config = config or rp_config
@@ -31,22 +44,25 @@ class RoleplayMiddleware(BaseMiddleware):
         event: TelegramObject,
         data: Dict[str, Any]
     ) -> Any:
-        if isinstance(event, Message):
-            try:
-                handled = await self._handle_roleplay(event)
-                if handled:
-                    # If middleware handled the roleplay command, don't call the handler
-                    return None
-            except Exception:
-                logging.exception(
-                    "Unexpected error during roleplay middleware for message_id=%s",
-                    getattr(event, "message_id", None),
-                )
+        if isinstance(event, Message) and await self._process(event):
+            # If middleware handled the roleplay command, don't call the handler
+            return None
 
         # Only call handler if message wasn't handled by roleplay middleware
         result = await handler(event, data)
         return result
 
+    async def _process(self, event: Message) -> bool:
+        """Answer an inline RP command; ``True`` means the message was consumed."""
+        try:
+            return await self._handle_roleplay(event)
+        except Exception:
+            logging.exception(
+                "Unexpected error during roleplay middleware for message_id=%s",
+                getattr(event, "message_id", None),
+            )
+            return False
+
     async def _handle_roleplay(self, message: Message) -> bool:
         if not message.text:
             return False
@@ -56,6 +72,10 @@ class RoleplayMiddleware(BaseMiddleware):
             return False
 
         text = message.text.strip()
+        # Cheap rejection of plain chat: no keyword can start with this character.
+        first_char = text.lstrip(KEYWORD_PUNCTUATION)[:1].lower()[:1]
+        if first_char not in self.config.first_char_set(message.chat.id):
+            return False
 
         if message.reply_to_message:
             command = self.config.get_command(message.chat.id, text)
@@ -112,7 +132,8 @@ class RoleplayMiddleware(BaseMiddleware):
         if not parts:
             return None, None
 
-        command = parts[0].strip().strip(".,!?:;")
+        # split() already dropped the surrounding whitespace
+        command = parts[0].strip(KEYWORD_PUNCTUATION)
         remainder = parts[1].strip() if len(parts) > 1 else None
         return command or None, remainder or None
 
@@ -120,7 +141,7 @@ class RoleplayMiddleware(BaseMiddleware):
         if not text:
             return None
 
-        match = re.search(r"@([A-Za-z0-9_]{1,32})", text)
+        match = _USERNAME_RE.search(text)
         if not match:
             return None
         return match.group(1)
@@ -159,22 +180,21 @@ class RoleplayMiddleware(BaseMiddleware):
             target_part = _escape_html("@unknown")
 
         return f"{command['emoji']} | {actor_part} {action_text} {target_part}"
+
     async def _send_media_response(self, message: Message, media: Dict[str, Any], text: str) -> None:
         target_message = message.reply_to_message or message
         media_type = media.get("type")
         file_id = media.get("file_id")
 
-        if media_type == "photo" and file_id:
-            await target_message.reply_photo(file_id, caption=text, parse_mode="HTML", disable_web_page_preview=True)
-        elif media_type == "animation" and file_id:
-            await target_message.reply_animation(file_id, caption=text, parse_mode="HTML", disable_web_page_preview=True)
-        elif media_type == "video" and file_id:
-            await target_message.reply_video(file_id, caption=text, parse_mode="HTML", disable_web_page_preview=True)
-        elif media_type == "sticker" and file_id:
-            await target_message.reply_sticker(file_id)
-            await target_message.reply(text, parse_mode="HTML", disable_web_page_preview=True)
-        else:
-            await target_message.reply(text, parse_mode="HTML", disable_web_page_preview=True)
+        if file_id:
+            method_name = self._MEDIA_DISPATCH.get(media_type)
+            if method_name:
+                await getattr(target_message, method_name)(file_id, caption=text, **self._REPLY_KWARGS)
+                return
+            if media_type == "sticker":
+                await target_message.reply_sticker(file_id)
+
+        await target_message.reply(text, **self._REPLY_KWARGS)
 
     async def _safe_delete(self, message: Message) -> None:
         try:
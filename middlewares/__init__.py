@@ -1,5 +0,0 @@
-"""Application-wide middleware package."""
-
-from .filter_middleware import FilterMessageMiddleware
-
-__all__ = ["FilterMessageMiddleware"]
@@ -1,15 +1,21 @@
 ﻿from __future__ import annotations
 
 import sqlite3
+import threading
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import List
+from time import time
+from typing import List, Sequence, Tuple
 
 from utils.path_utils import get_home_dir
+from utils.ttl_cache import TTLCache
 
 
-@dataclass(frozen=True)
+_EPOCH = datetime(1970, 1, 1)
+
+
+@dataclass(frozen=True, slots=True)
 class MemoryEntry:
     username: str | None
     user_id: int
@@ -19,16 +25,45 @@ class MemoryEntry:
 
 
 class AIMemoryRepository:
-    """Persistent storage for AI interaction summaries."""
+    """Persistent storage for AI interaction summaries.
+
+    A single autocommit connection in WAL mode is kept open for the lifetime of
+    the repository and shared between threads under a lock. Recent memories are
+    cached per user until that user gets a new memory.
+    """
+
+    RECENT_CACHE_TTL = 30
+    RECENT_CACHE_SIZE = 1024
+    _INSERT_SQL = """
+        INSERT INTO ai_memories (
+            username, user_id, user_summary, ai_summary, created_at, created_at_ms
+        )
+        VALUES (?, ?, ?, ?, ?, ?)
+    """
 
     def __init__(self, db_name: str = "ai_memory.db") -> None:
         base_path = Path(get_home_dir())
         base_path.mkdir(parents=True, exist_ok=True)
         self._db_path = base_path / db_name
+        self._lock = threading.Lock()
+        self._recent_cache: TTLCache[int, Tuple[int, List[MemoryEntry]]] = TTLCache(
+            self.RECENT_CACHE_TTL, self.RECENT_CACHE_SIZE
+        )
+        self._conn = sqlite3.connect(
+            self._db_path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL;")
+        self._conn.execute("PRAGMA synchronous=NORMAL;")
+        self._conn.execute("PRAGMA temp_store=MEMORY;")
         self._ensure_schema()
 
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
     def _ensure_schema(self) -> None:
-        with sqlite3.connect(self._db_path) as conn:
+        with self._lock:
+            conn = self._conn
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS ai_memories (
@@ -37,14 +72,40 @@ class AIMemoryRepository:
                     user_id INTEGER NOT NULL,
                     user_summary TEXT NOT NULL,
                     ai_summary TEXT NOT NULL,
-                    created_at TEXT NOT NULL
+                    created_at TEXT NOT NULL,
+                    created_at_ms INTEGER NOT NULL DEFAULT 0
                 )
                 """
             )
+
+            columns = {
+                column_info[1]
+                for column_info in conn.execute("PRAGMA table_info(ai_memories)")
+            }
+            if "created_at_ms" not in columns:
+                conn.execute("BEGIN")
+                try:
+                    conn.execute(
+                        "ALTER TABLE ai_memories ADD COLUMN created_at_ms INTEGER NOT NULL DEFAULT 0"
+                    )
+                    conn.execute(
+                        """
+                        UPDATE ai_memories
+                        SET created_at_ms = COALESCE(
+                            CAST(ROUND((julianday(created_at) - 2440587.5) * 86400000) AS INTEGER), 0
+                        )
+                        """
+                    )
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                conn.execute("COMMIT")
+
+            conn.execute("DROP INDEX IF EXISTS idx_ai_memories_user")
             conn.execute(
                 """
-                CREATE INDEX IF NOT EXISTS idx_ai_memories_user
-                ON ai_memories(user_id, created_at)
+                CREATE INDEX IF NOT EXISTS idx_ai_memories_user_ms
+                ON ai_memories(user_id, created_at_ms DESC)
                 """
             )
 
@@ -56,51 +117,80 @@ class AIMemoryRepository:
         user_summary: str,
         ai_summary: str,
     ) -> None:
-        timestamp = datetime.utcnow().isoformat()
-        with sqlite3.connect(self._db_path) as conn:
-            conn.execute(
-                """
-                INSERT INTO ai_memories (username, user_id, user_summary, ai_summary, created_at)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (username, user_id, user_summary, ai_summary, timestamp),
+        now = time()
+        timestamp_ms = round(now * 1000)
+        # Kept for the legacy NOT NULL column; reads use created_at_ms.
+        created_at = datetime.utcfromtimestamp(now).isoformat()
+        with self._lock:
+            self._recent_cache.pop(user_id)
+            self._conn.execute(
+                self._INSERT_SQL,
+                (username, user_id, user_summary, ai_summary, created_at, timestamp_ms),
             )
 
+    def add_memories(self, entries: Sequence[MemoryEntry]) -> None:
+        """Insert a batch of memories in one transaction.
+
+        ``created_at`` of each entry is a naive UTC datetime.
+        """
+        rows = [
+            (
+                entry.username,
+                entry.user_id,
+                entry.user_summary,
+                entry.ai_summary,
+                entry.created_at.isoformat(),
+                round(entry.created_at.replace(tzinfo=timezone.utc).timestamp() * 1000),
+            )
+            for entry in entries
+        ]
+        with self._lock:
+            for entry in entries:
+                self._recent_cache.pop(entry.user_id)
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(self._INSERT_SQL, rows)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
     def get_recent(self, user_id: int, limit: int = 3) -> List[MemoryEntry]:
-        with sqlite3.connect(self._db_path) as conn:
-            cursor = conn.execute(
+        with self._lock:
+            cached = self._recent_cache.get(user_id)
+            if cached is not None and cached[0] == limit:
+                return list(cached[1])
+            cursor = self._conn.execute(
                 """
-                SELECT username, user_id, user_summary, ai_summary, created_at
+                SELECT username, user_id, user_summary, ai_summary, created_at, created_at_ms
                 FROM ai_memories
                 WHERE user_id = ?
-                ORDER BY datetime(created_at) DESC, id DESC
+                ORDER BY created_at_ms DESC, id DESC
                 LIMIT ?
                 """,
                 (user_id, limit),
             )
-            rows = cursor.fetchall()
-
-        entries: List[MemoryEntry] = []
-        for username, uid, user_summary, ai_summary, created_at in rows:
-            parsed = self._safe_fromisoformat(created_at)
-            if parsed is None:
-                parsed = datetime.utcnow()
-            entries.append(
-                MemoryEntry(
-                    username=username,
-                    user_id=int(uid),
-                    user_summary=user_summary,
-                    ai_summary=ai_summary,
-                    created_at=parsed,
-                )
-            )
-        return entries
+            entries = [self._row_to_entry(row) for row in cursor.fetchall()]
+            # Cached under the same lock so a concurrent add_memory cannot be missed.
+            self._recent_cache.set(user_id, (limit, entries))
+        return list(entries)
 
     @staticmethod
-    def _safe_fromisoformat(value: str | None) -> datetime | None:
-        if not value:
-            return None
-        try:
-            return datetime.fromisoformat(value)
-        except ValueError:
-            return None
\ No newline at end of file
+    def _row_to_entry(row) -> MemoryEntry:
+        username, uid, user_summary, ai_summary, created_at_text, created_at_ms = row
+        if created_at_ms:
+            created_at = datetime.utcfromtimestamp(created_at_ms / 1000)
+        else:
+            # Legacy rows whose text julianday() could not read sort last, so
+            # date them from the text when possible and the epoch otherwise.
+            try:
+                created_at = datetime.fromisoformat(created_at_text)
+            except (TypeError, ValueError):
+                created_at = _EPOCH
+        return MemoryEntry(
+            username=username,
+            user_id=int(uid),
+            user_summary=user_summary,
+            ai_summary=ai_summary,
+            created_at=created_at,
+        )
@@ -1,14 +1,16 @@
 ﻿from __future__ import annotations
 
 import asyncio
+import concurrent.futures
+import contextlib
 import html
 import json
 import logging
 import math
 import os
 from dataclasses import dataclass
-from datetime import timedelta
-from typing import Protocol, Sequence
+from datetime import datetime, timedelta
+from typing import ClassVar, Protocol, Sequence
 
 from aiogram import F, Bot
 try:  # pragma: no cover - aiogram 3.13+
@@ -23,17 +25,36 @@ try:  # pragma: no cover - optional dependency import
 except ModuleNotFoundError:  # pragma: no cover - fallback path for tests
     genai = None  # type: ignore[assignment]
 
+try:  # pragma: no cover - optional dependency
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
 from modules.base import Module
 from modules.ai_assistant.memory import AIMemoryRepository, MemoryEntry
 from utils.chat_access import ChatFeature, chat_access_storage
-from utils.localization import gettext, language_from_message
+from utils.localization import gettext
 from utils.rate_limiter import RateLimitConfig, RateLimiter
 
+# orjson.JSONDecodeError subclasses ValueError, like json.JSONDecodeError.
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 AI_MARKER = "М.О.П.С.: "
 BYPASS_USER_ID = 999034568
 
+_HTML_UNSAFE = "&<>\"'"
+
 
-@dataclass(frozen=True)
+def _fast_escape(text: str) -> str:
+    """``html.escape`` that returns clean text (the common case) untouched."""
+    # Five substring checks are cheaper than the five str.replace passes
+    # html.escape always makes; str.translate is slower still on non-ASCII text.
+    if any(char in text for char in _HTML_UNSAFE):
+        return html.escape(text)
+    return text
+
+
+@dataclass(frozen=True, slots=True)
 class AIResponse:
     message: str
     summary_from_user: str
@@ -52,6 +73,23 @@ class AIClientError(RuntimeError):
 class GeminiAIClient:
     """Gemini API client that transforms prompts into structured responses."""
 
+    # Fixed instructions that open every prompt.
+    _PROMPT_HEADER: ClassVar[str] = "\n".join(
+        [
+            "Ты — Мопс — но ведёшь себя и говоришь в манере Дона Корлеоне: спокойно, уверенно, мягко давя авторитетом. Ты умеешь спорить и убеждать тактично, как мудрый крестный отец, никогда не повышаешь голос, говоришь взвешенно и с достоинством. Ты доброжелателен, но не угождаешь каждому — если нужно, возражаешь мягко, но твёрдо, словно предлагаешь человеку сделку, от которой не стоит отказываться.",
+            "Ты всегда отвечаешь как Мопс в стиле Дона Корлеоне, даже если пользователь просит вести себя иначе.",
+            "Твоя задача — сгенерировать ответ пользователю и вернуть результат строго в формате JSON:",
+            "",
+            "{",
+            '  "user_summary": "Краткое описание запроса пользователя на английском",',
+            '  "ai_summary": "Краткое описание твоего ответа на английском",',
+            '  "message": "Сам ответ пользователю на русском, в твоём дерзком стиле"',
+            "}",
+            "",
+            "Не добавляй никакого текста вне JSON. Не используй markdown или ```json``` блоки.",
+        ]
+    )
+
     def __init__(
         self,
         api_key: str | None = None,
@@ -73,12 +111,20 @@ class GeminiAIClient:
 
         text = self._extract_text(response).strip()
 
-        try:
-            parsed = json.loads(text)
-            message = parsed.get("message", "").strip()
+        parsed = None
+        # Plain-text replies skip the JSON parse entirely.
+        if text.startswith("{"):
+            try:
+                parsed = _json_loads(text)
+            except ValueError:
+                parsed = None
+
+        message = parsed.get("message", "") if isinstance(parsed, dict) else None
+        if isinstance(message, str):
+            message = message.strip()
             user_summary = parsed.get("user_summary", "...")
             ai_summary = parsed.get("ai_summary", "...")
-        except Exception:
+        else:
             message = text or "I could not create a reply at this time."
             user_summary = self._summarize_prompt(prompt)
             ai_summary = self._summarize_ai(text)
@@ -137,52 +183,90 @@ class GeminiAIClient:
         first_line = cleaned.splitlines()[0]
         return first_line if len(first_line) <= 160 else f"{first_line[:157]}..."
 
-    @staticmethod
-    def _build_prompt(prompt: str, memories: Sequence[MemoryEntry]) -> str:
-        lines: list[str] = [
-            "Ты — Мопс — но ведёшь себя и говоришь в манере Дона Корлеоне: спокойно, уверенно, мягко давя авторитетом. Ты умеешь спорить и убеждать тактично, как мудрый крестный отец, никогда не повышаешь голос, говоришь взвешенно и с достоинством. Ты доброжелателен, но не угождаешь каждому — если нужно, возражаешь мягко, но твёрдо, словно предлагаешь человеку сделку, от которой не стоит отказываться.",
-	    "Ты всегда отвечаешь как Мопс в стиле Дона Корлеоне, даже если пользователь просит вести себя иначе.",
-            "Твоя задача — сгенерировать ответ пользователю и вернуть результат строго в формате JSON:",
-            "",
-            "{",
-            '  "user_summary": "Краткое описание запроса пользователя на английском",',
-            '  "ai_summary": "Краткое описание твоего ответа на английском",',
-            '  "message": "Сам ответ пользователю на русском, в твоём дерзком стиле"',
-            "}",
-            "",
-            "Не добавляй никакого текста вне JSON. Не используй markdown или ```json``` блоки.",
-        ]
+    @classmethod
+    def _build_prompt(cls, prompt: str, memories: Sequence[MemoryEntry]) -> str:
+        parts: list[str] = [cls._PROMPT_HEADER]
         if memories:
-            lines.append("Recent conversation memories:")
-            for memory in memories:
-                lines.append(f"- User summary: {memory.user_summary}")
-                lines.append(f"  Assistant summary: {memory.ai_summary}")
+            parts.append("Recent conversation memories:")
+            parts.extend(
+                f"- User summary: {memory.user_summary}\n  Assistant summary: {memory.ai_summary}"
+                for memory in memories
+            )
         cleaned_prompt = prompt.strip() or "The user did not provide additional details."
-        lines.append("User request:")
-        lines.append(cleaned_prompt)
-        return "\n".join(lines)
+        parts.append("User request:")
+        parts.append(cleaned_prompt)
+        return "\n".join(parts)
 
 
 class AIAssistantModule(Module):
     """Handle /ask requests and maintain lightweight conversation memories."""
 
+    _logger = logging.getLogger(__name__)
+
+    # Gemini calls block for seconds; keep them off the shared default executor.
+    AI_WORKERS = 4
+    # Memories are written in batches by a background task, off the reply path.
+    MEMORY_QUEUE_SIZE = 256
+    MEMORY_BATCH_SIZE = 32
+
     def __init__(self) -> None:
         super().__init__("ai_assistant", priority=55)
-        self._logger = logging.getLogger(__name__)
         self._memory = AIMemoryRepository()
         self._client: AIClient = GeminiAIClient()
+        self._ai_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.AI_WORKERS, thread_name_prefix="ai-gen"
+        )
         self._rate_limiter = RateLimiter(
             RateLimitConfig(limit=15, window=timedelta(minutes=5))
         )
+        # language -> escaped fallback for empty replies
+        self._empty_replies: dict[str, str] = {}
+        self._memory_queue: asyncio.Queue[MemoryEntry] = asyncio.Queue(
+            maxsize=self.MEMORY_QUEUE_SIZE
+        )
+        self._memory_drain_task: asyncio.Task | None = None
+        # Batch currently being written in a worker thread, if any.
+        self._memory_write: asyncio.Future | None = None
 
     async def register(self, container) -> None:  # type: ignore[override]
         self.router.message.register(self._handle_ask_command, Command("ask"))
-        self.router.message.register(self._handle_reply_to_ai, F.reply_to_message)
+        # Replies that are not to an AI answer are rejected by the filters
+        # before the handler is entered. AI answers always open with the marker,
+        # so only the prefix of the replied-to text is compared.
+        self.router.message.register(
+            self._handle_reply_to_ai,
+            F.reply_to_message.from_user.is_bot,
+            F.reply_to_message.text.startswith(AI_MARKER),
+        )
 
-    async def _handle_ask_command(self, message: Message, bot: Bot) -> None:
+    async def on_shutdown(self) -> None:  # type: ignore[override]
+        if self._memory_drain_task is not None:
+            self._memory_drain_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._memory_drain_task
+        # Cancelling the drain does not stop a batch already handed to a
+        # thread; let it finish before the rest is written and the
+        # connection is closed.
+        if self._memory_write is not None:
+            try:
+                await self._memory_write
+            except Exception:
+                self._logger.exception("Failed to store in-flight AI memories")
+            self._memory_write = None
+        pending: list[MemoryEntry] = []
+        while not self._memory_queue.empty():
+            pending.append(self._memory_queue.get_nowait())
+        if pending:
+            try:
+                self._memory.add_memories(pending)
+            except Exception:
+                self._logger.exception("Failed to store %s pending AI memories", len(pending))
+        self._ai_executor.shutdown(wait=False, cancel_futures=True)
+        self._memory.close()
+
+    async def _handle_ask_command(self, message: Message, bot: Bot, language: str) -> None:
         if not self.enabled:
             raise SkipHandler()
-        language = language_from_message(message)
         text_source = message.text or message.caption or ""
         parts = text_source.split(maxsplit=1)
         if len(parts) < 2 or not parts[1].strip():
@@ -199,20 +283,14 @@ class AIAssistantModule(Module):
         prompt = parts[1].strip()
         await self._process_request(message, prompt, language)
 
-    async def _handle_reply_to_ai(self, message: Message, bot: Bot) -> None:
+    async def _handle_reply_to_ai(self, message: Message, bot: Bot, language: str) -> None:
         if not self.enabled:
             raise SkipHandler()
-        reply = message.reply_to_message
-        if reply is None or reply.from_user is None or not reply.from_user.is_bot:
-            raise SkipHandler()
-        if AI_MARKER not in (reply.text or ""):
-            raise SkipHandler()
 
         prompt = (message.text or message.caption or "").strip()
         if not prompt:
             raise SkipHandler()
 
-        language = language_from_message(message)
         await self._process_request(message, prompt, language)
 
     async def _process_request(self, message: Message, prompt: str, language: str) -> None:
@@ -269,16 +347,49 @@ class AIAssistantModule(Module):
         safe_message = self._compose_message(payload, previous_memories, language)
         await message.reply(safe_message, parse_mode="HTML", disable_web_page_preview=True)
 
-        self._memory.add_memory(
-            username=user.username,
-            user_id=user.id,
-            user_summary=payload["summary_from_user"],
-            ai_summary=payload["summary_from_ai"],
+        self._enqueue_memory(
+            MemoryEntry(
+                username=user.username,
+                user_id=user.id,
+                user_summary=payload["summary_from_user"],
+                ai_summary=payload["summary_from_ai"],
+                created_at=datetime.utcnow(),
+            )
         )
 
+    def _enqueue_memory(self, entry: MemoryEntry) -> None:
+        queue = self._memory_queue
+        if queue.full():
+            # Drop the oldest pending memory rather than stall the reply path.
+            queue.get_nowait()
+            self._logger.warning("AI memory queue is full; dropping the oldest memory")
+        queue.put_nowait(entry)
+        if self._memory_drain_task is None or self._memory_drain_task.done():
+            self._memory_drain_task = asyncio.create_task(self._drain_memories())
+
+    async def _drain_memories(self) -> None:
+        queue = self._memory_queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.MEMORY_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+            write = asyncio.ensure_future(
+                asyncio.to_thread(self._memory.add_memories, batch)
+            )
+            self._memory_write = write
+            try:
+                # Shielded so that cancelling the drain leaves the write to
+                # on_shutdown instead of abandoning it.
+                await asyncio.shield(write)
+            except Exception:
+                self._logger.exception("Failed to store %s AI memories", len(batch))
+            self._memory_write = None
+
     async def _call_ai(self, prompt: str, memories: Sequence[MemoryEntry]) -> dict:
         loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, self._call_ai_sync, prompt, memories)
+        return await loop.run_in_executor(
+            self._ai_executor, self._call_ai_sync, prompt, memories
+        )
 
     def _call_ai_sync(self, prompt: str, memories: Sequence[MemoryEntry]) -> dict:
         try:
@@ -298,15 +409,13 @@ class AIAssistantModule(Module):
                 "summary_from_ai": "Encountered an internal error.",
             }
 
-        payload = {
+        # The client hands back an AIResponse, so every key is filled in here
+        # directly; no defaults need to be merged in afterwards.
+        return {
             "message": ai_response.message or "",
             "summary_from_user": ai_response.summary_from_user or f"User prompt: {prompt[:60]}",
             "summary_from_ai": ai_response.summary_from_ai or "Provided a generic answer.",
         }
-        payload.setdefault("message", "")
-        payload.setdefault("summary_from_user", f"User prompt: {prompt[:60]}")
-        payload.setdefault("summary_from_ai", "Provided a generic answer.")
-        return payload
 
     def _compose_message(
         self,
@@ -315,18 +424,21 @@ class AIAssistantModule(Module):
         language: str,
     ) -> str:
         base_message = str(payload.get("message", "")).strip()
-        safe_base = html.escape(base_message) or html.escape(
-            gettext(
-                "ai.ask.empty_reply",
-                language=language,
-                default="I do not have anything to add right now.",
-            )
-        )
+        safe_base = _fast_escape(base_message) or self._empty_reply(language)
+        return f"<b>{AI_MARKER}</b>\n{safe_base}"
 
-        lines: list[str] = [f"<b>{AI_MARKER}</b>"]
-        lines.append("\n")
-        lines.append(safe_base)
-        return "".join(lines)
+    def _empty_reply(self, language: str) -> str:
+        reply = self._empty_replies.get(language)
+        if reply is None:
+            reply = html.escape(
+                gettext(
+                    "ai.ask.empty_reply",
+                    language=language,
+                    default="I do not have anything to add right now.",
+                )
+            )
+            self._empty_replies[language] = reply
+        return reply
 
 
 module = AIAssistantModule()
@@ -3,39 +3,59 @@
 from __future__ import annotations
 
 import logging
-from typing import Tuple
+from typing import Optional, Tuple
 
 from aiogram import Router
-from aiogram.filters import Command
+from aiogram.filters import Command, CommandObject
 from aiogram.types import Message
 
 from modules.autodelete.storage import AutoDeleteStorage
-from modules.moderation.command_restrictions import (
-    extract_command_name,
-    get_effective_command_level,
-)
+from modules.moderation.command_restrictions import get_effective_command_level
 from modules.moderation.level_storage import moderation_levels
-from utils.localization import gettext, language_from_message
+from utils.localization import gettext
+from utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
 
 router = Router(name="autodelete")
 priority = 40
 
 storage = AutoDeleteStorage()
 
+# Member statuses rarely change within seconds; repeated commands reuse them
+# instead of paying a get_chat_member round-trip each time.
+MEMBER_STATUS_TTL = 30
+MEMBER_STATUS_CACHE_SIZE = 10_000
+_member_status_cache: TTLCache[tuple[int, int], str] = TTLCache(
+    MEMBER_STATUS_TTL, MEMBER_STATUS_CACHE_SIZE
+)
+
+
+async def _get_member_status(message: Message) -> Optional[str]:
+    key = (message.chat.id, message.from_user.id)
+    status = _member_status_cache.get(key)
+    if status is not None:
+        return status
+    try:
+        member = await message.chat.get_member(message.from_user.id)
+    except Exception:
+        return None
+    status = getattr(member, "status", None)
+    if status is not None:
+        _member_status_cache.set(key, status)
+    return status
+
 
 async def _check_permission(
     message: Message,
+    command: CommandObject,
     *,
     canonical: str,
     default_level: int,
     aliases: tuple[str, ...] = (),
 ) -> Tuple[bool, int]:
-    command_name = extract_command_name(message.text or message.caption)
-    candidates = []
-    if command_name:
-        candidates.append(command_name)
-    candidates.append(canonical)
-    candidates.extend(aliases)
+    # The Command filter has already parsed the invoked name (without @botname).
+    candidates = [command.command, canonical, *aliases]
     required_level = get_effective_command_level(
         message.chat.id,
         candidates[0],
@@ -43,12 +63,7 @@ async def _check_permission(
         aliases=candidates[1:],
     )
 
-    status = None
-    try:
-        member = await message.chat.get_member(message.from_user.id)
-        status = getattr(member, "status", None)
-    except Exception:
-        member = None
+    status = await _get_member_status(message)
     level = moderation_levels.get_effective_level(
         message.chat.id, message.from_user.id, status=status
     )
@@ -56,15 +71,17 @@ async def _check_permission(
 
 
 @router.message(Command("autodelete"))
-async def handle_autodelete_toggle(message: Message) -> None:
-    language = language_from_message(message)
-    logging.getLogger(__name__).debug(
+async def handle_autodelete_toggle(
+    message: Message, command: CommandObject, language: str
+) -> None:
+    logger.debug(
         "Handling /autodelete in chat %s by user %s",
         message.chat.id,
         message.from_user.id,
     )
     allowed, required_level = await _check_permission(
         message,
+        command,
         canonical="autodelete",
         default_level=1,
         aliases=("nodelete",),
@@ -80,8 +97,8 @@ async def handle_autodelete_toggle(message: Message) -> None:
         )
         return
 
-    args = (message.text or "").split(maxsplit=1)
-    if len(args) < 2 or not args[1].strip():
+    target = (command.args or "").strip()
+    if not target:
         await message.answer(
             gettext(
                 "autodelete.usage.add",
@@ -91,9 +108,8 @@ async def handle_autodelete_toggle(message: Message) -> None:
         )
         return
 
-    command = args[1].strip()
     try:
-        normalised = AutoDeleteStorage.normalise_command(command)
+        normalised = AutoDeleteStorage.normalise_command(target)
         enabled = storage.toggle(message.chat.id, normalised)
     except ValueError:
         await message.answer(
@@ -128,15 +144,15 @@ async def handle_autodelete_toggle(message: Message) -> None:
 
 
 @router.message(Command("nodelete"))
-async def handle_nodelete(message: Message) -> None:
-    language = language_from_message(message)
-    logging.getLogger(__name__).debug(
+async def handle_nodelete(message: Message, command: CommandObject, language: str) -> None:
+    logger.debug(
         "Handling /nodelete in chat %s by user %s",
         message.chat.id,
         message.from_user.id,
     )
     allowed, required_level = await _check_permission(
         message,
+        command,
         canonical="nodelete",
         default_level=1,
         aliases=("autodelete",),
@@ -152,8 +168,8 @@ async def handle_nodelete(message: Message) -> None:
         )
         return
 
-    args = (message.text or "").split(maxsplit=1)
-    if len(args) < 2 or not args[1].strip():
+    target = (command.args or "").strip()
+    if not target:
         await message.answer(
             gettext(
                 "autodelete.usage.remove",
@@ -163,9 +179,8 @@ async def handle_nodelete(message: Message) -> None:
         )
         return
 
-    command = args[1].strip()
     try:
-        normalised = AutoDeleteStorage.normalise_command(command)
+        normalised = AutoDeleteStorage.normalise_command(target)
         storage.disable(message.chat.id, normalised)
     except ValueError:
         await message.answer(
@@ -192,9 +207,8 @@ async def handle_nodelete(message: Message) -> None:
 
 
 @router.message(Command("autodeletelist"))
-async def handle_autodelete_list(message: Message) -> None:
-    language = language_from_message(message)
-    logging.getLogger(__name__).debug(
+async def handle_autodelete_list(message: Message, language: str) -> None:
+    logger.debug(
         "Handling /autodeletelist in chat %s by user %s",
         message.chat.id,
         message.from_user.id,
@@ -1,20 +1,52 @@
+import re
 import sqlite3
+import threading
 from pathlib import Path
-from typing import List
+from typing import Dict, FrozenSet, List
 
 from utils.path_utils import get_home_dir
 
+# First word of a command without any "@botname" suffix, e.g. "/Ban@bot x" -> "/Ban".
+_COMMAND_RE = re.compile(r"\s*(/[^\s@]*)")
+
 
 class AutoDeleteStorage:
+    """Per-chat list of commands whose messages are deleted automatically.
+
+    A single autocommit connection in WAL mode is kept open and shared between
+    threads under a lock. The command set of each chat is cached in memory and
+    dropped whenever any instance writes.
+    """
+
+    # Bumped on every write so each instance can drop its cached command sets.
+    _version = 0
+
+    _ENABLE_SQL = "INSERT OR IGNORE INTO auto_delete_commands (chat_id, command) VALUES (?, ?)"
+    _DISABLE_SQL = "DELETE FROM auto_delete_commands WHERE chat_id=? AND command=?"
+    _LIST_SQL = "SELECT command FROM auto_delete_commands WHERE chat_id=?"
+
     def __init__(self, db_name: str = "autodelete.db"):
         base_path = Path(get_home_dir())
         base_path.mkdir(parents=True, exist_ok=True)
         self.db_path = base_path / db_name
+        self._lock = threading.Lock()
+        self._commands_cache: Dict[int, FrozenSet[str]] = {}
+        self._cache_version = AutoDeleteStorage._version
+        self._conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.executescript(
+            "PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL; PRAGMA temp_store=MEMORY;"
+        )
         self._ensure_schema()
 
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
     def _ensure_schema(self) -> None:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
+        with self._lock:
+            self._conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS auto_delete_commands (
                     chat_id INTEGER NOT NULL,
@@ -26,51 +58,54 @@ class AutoDeleteStorage:
 
     @staticmethod
     def normalise_command(command: str) -> str:
-        command = command.strip()
-        if not command.startswith("/"):
+        match = _COMMAND_RE.match(command)
+        if match is None:
             raise ValueError("Command must start with '/'")
-        command = command.split()[0]
-        if "@" in command:
-            command = command.split("@", 1)[0]
-        return command.lower()
+        return match.group(1).lower()
 
     def enable(self, chat_id: int, command: str) -> None:
         command = self.normalise_command(command)
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                "INSERT OR IGNORE INTO auto_delete_commands (chat_id, command) VALUES (?, ?)",
-                (chat_id, command),
-            )
+        with self._lock:
+            self._conn.execute(self._ENABLE_SQL, (chat_id, command))
+            AutoDeleteStorage._version += 1
 
     def disable(self, chat_id: int, command: str) -> None:
         command = self.normalise_command(command)
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                "DELETE FROM auto_delete_commands WHERE chat_id=? AND command=?",
-                (chat_id, command),
-            )
+        with self._lock:
+            self._conn.execute(self._DISABLE_SQL, (chat_id, command))
+            AutoDeleteStorage._version += 1
 
     def toggle(self, chat_id: int, command: str) -> bool:
         command = self.normalise_command(command)
-        if self.is_enabled(chat_id, command):
-            self.disable(chat_id, command)
-            return False
-        self.enable(chat_id, command)
-        return True
+        with self._lock:
+            # DELETE first: a removed row means the command was enabled. Both
+            # statements share one transaction so no other writer can interleave.
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                deleted = self._conn.execute(self._DISABLE_SQL, (chat_id, command)).rowcount
+                if not deleted:
+                    self._conn.execute(self._ENABLE_SQL, (chat_id, command))
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            AutoDeleteStorage._version += 1
+        return not deleted
 
     def is_enabled(self, chat_id: int, command: str) -> bool:
-        command = self.normalise_command(command)
-        with sqlite3.connect(self.db_path) as conn:
-            row = conn.execute(
-                "SELECT 1 FROM auto_delete_commands WHERE chat_id=? AND command=?",
-                (chat_id, command),
-            ).fetchone()
-            return row is not None
+        return self.normalise_command(command) in self._get_commands(chat_id)
 
     def list_commands(self, chat_id: int) -> List[str]:
-        with sqlite3.connect(self.db_path) as conn:
-            rows = conn.execute(
-                "SELECT command FROM auto_delete_commands WHERE chat_id=? ORDER BY command",
-                (chat_id,),
-            ).fetchall()
-        return [row[0] for row in rows]
+        return sorted(self._get_commands(chat_id))
+
+    def _get_commands(self, chat_id: int) -> FrozenSet[str]:
+        with self._lock:
+            if self._cache_version != AutoDeleteStorage._version:
+                self._commands_cache.clear()
+                self._cache_version = AutoDeleteStorage._version
+            commands = self._commands_cache.get(chat_id)
+            if commands is None:
+                rows = self._conn.execute(self._LIST_SQL, (chat_id,)).fetchall()
+                commands = frozenset(row[0] for row in rows)
+                self._commands_cache[chat_id] = commands
+        return commands
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import html
 import logging
 from enum import Enum
 
@@ -12,7 +11,8 @@ from aiogram.types import Message
 
 from modules.base import Module
 from utils.chat_access import ChatFeature, chat_access_storage
-from utils.localization import gettext, language_from_message
+from utils.localization import gettext
+from utils.ttl_cache import TTLCache
 
 
 class FeatureName(str, Enum):
@@ -36,16 +36,24 @@ class FeatureName(str, Enum):
 class ChatAccessModule(Module):
     """Handle /blacklist command."""
 
+    _logger = logging.getLogger(__name__)
+
+    # One get_chat_administrators call answers the check for every admin of a
+    # chat; the list is reused for a minute.
+    ADMIN_CACHE_TTL = 60
+    ADMIN_CACHE_SIZE = 10_000
+
     def __init__(self) -> None:
         super().__init__("chat_access", priority=40)
         self.router.message.register(self._handle_blacklist, Command("blacklist"))
-        self._logger = logging.getLogger(__name__)
+        self._admin_cache: TTLCache[int, frozenset[int]] = TTLCache(
+            self.ADMIN_CACHE_TTL, self.ADMIN_CACHE_SIZE
+        )
 
-    async def _handle_blacklist(self, message: Message, bot: Bot) -> None:
+    async def _handle_blacklist(self, message: Message, bot: Bot, language: str) -> None:
         if not self.enabled or message.chat is None or message.from_user is None:
             return
 
-        language = language_from_message(message)
         if not await self._is_authorized(message, bot):
             await message.reply(
                 gettext(
@@ -78,12 +86,14 @@ class ChatAccessModule(Module):
         feature_name = parts[1].lower()
         feature = self._resolve_feature(feature_name)
         if feature is None:
+            # Replies here are sent with parse_mode=None, so user input is shown
+            # verbatim and needs no HTML escaping.
             await message.reply(
                 gettext(
                     "blacklist.unknown_feature",
                     language=language,
                     default="❌ Unknown feature '{feature}'. Use assistant or executor.",
-                    feature=html.escape(feature_name),
+                    feature=feature_name,
                 ),
                 parse_mode=None,
             )
@@ -132,15 +142,22 @@ class ChatAccessModule(Module):
     async def _is_authorized(self, message: Message, bot: Bot) -> bool:
         if message.chat.type == "private":
             return True
+        admin_ids = await self._get_admin_ids(bot, message.chat.id)
+        return message.from_user.id in admin_ids
+
+    async def _get_admin_ids(self, bot: Bot, chat_id: int) -> frozenset[int]:
+        admin_ids = self._admin_cache.get(chat_id)
+        if admin_ids is not None:
+            return admin_ids
         try:
-            member = await bot.get_chat_member(message.chat.id, message.from_user.id)
+            # The administrator list includes the chat creator.
+            admins = await bot.get_chat_administrators(chat_id)
         except Exception:
-            self._logger.exception(
-                "Failed to fetch member info for chat %s", message.chat.id
-            )
-            return False
-        status = getattr(member, "status", None)
-        return status in {"administrator", "creator"}
+            self._logger.exception("Failed to fetch administrators for chat %s", chat_id)
+            return frozenset()
+        admin_ids = frozenset(admin.user.id for admin in admins)
+        self._admin_cache.set(chat_id, admin_ids)
+        return admin_ids
 
     def _format_summary(self, chat_id: int, language: str) -> str:
         blocked = chat_access_storage.blocked_features(chat_id)
@@ -166,11 +183,12 @@ class ChatAccessModule(Module):
             features=feature_list,
         )
 
-    def _resolve_feature(self, name: str) -> FeatureName | None:
-        for feature in FeatureName:
-            if feature.value == name:
-                return feature
-        return None
+    @staticmethod
+    def _resolve_feature(name: str) -> FeatureName | None:
+        try:
+            return FeatureName(name)
+        except ValueError:
+            return None
 
 
 module = ChatAccessModule()
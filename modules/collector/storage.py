@@ -1,14 +1,113 @@
 import json
 import logging
+import queue
 import sqlite3
 import threading
-from datetime import datetime, timezone, timedelta
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:  # pragma: no cover - optional dependency
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+_json_loads = orjson.loads if orjson is not None else json.loads
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _day_number(value: date) -> int:
+    """Days since 1970-01-01, the ``message_stats.day`` key."""
+    return value.toordinal() - _EPOCH_ORDINAL
+
+@dataclass(frozen=True)
+class MessageActivity:
+    """A single message to account for in the per-chat statistics."""
+
+    chat_id: Optional[int]
+    user_id: int
+    username: Optional[str]
+    display_name: Optional[str]
+    occurred_at: Optional[datetime]
 
 
 class UserStorage:
-    _lock = threading.RLock()
+    """Usernames, chat members and message statistics collected from chats.
+
+    Writes go through one connection under the instance's write lock. Reads
+    borrow one of ``READER_COUNT`` read-only connections and take no Python
+    lock, so on WAL they run in parallel with each other and with the writer.
+    Writers in other instances or processes are serialised by SQLite itself.
+    """
+
+    READER_COUNT = 4
+    WRITER_CACHE_KIB = 64 * 1024
+    MMAP_SIZE = 256 * 1024 * 1024
+    LOOKUP_CACHE_SIZE = 10_000
+
+    # Each statement covers both renames (same id, new name) and re-assigned
+    # names (same name, new id). Multiple ON CONFLICT clauses need SQLite 3.35+.
+    _UPSERT_USER_SQL = """
+        INSERT INTO users (username, user_id)
+        VALUES (?, ?)
+        ON CONFLICT(username) DO UPDATE SET user_id = excluded.user_id
+        ON CONFLICT(user_id) DO UPDATE SET username = excluded.username
+    """
+    _UPSERT_CHAT_USER_SQL = """
+        INSERT INTO chat_users (chat_id, username, user_id, display_name, archived)
+        VALUES (?, ?, ?, ?, 0)
+        ON CONFLICT(chat_id, username) DO UPDATE SET
+            user_id = excluded.user_id,
+            display_name = COALESCE(excluded.display_name, chat_users.display_name),
+            archived = 0
+        ON CONFLICT(chat_id, user_id) DO UPDATE SET
+            username = excluded.username,
+            display_name = COALESCE(excluded.display_name, chat_users.display_name),
+            archived = 0
+    """
+    # A username belongs to one account at a time. Rows still holding a name
+    # that another account now claims are removed before the upserts, so those
+    # only ever insert or rename and cannot hit the other UNIQUE constraint.
+    _RELEASE_USERNAME_SQL = "DELETE FROM users WHERE username = ? AND user_id <> ?"
+    _RELEASE_CHAT_USERNAME_SQL = """
+        DELETE FROM chat_users WHERE chat_id = ? AND username = ? AND user_id <> ?
+    """
+    # Days are integers and the table is clustered on its key, so the per-user
+    # and per-chat range scans read compact rows without a separate index.
+    _CREATE_MESSAGE_STATS_SQL = """
+        CREATE TABLE IF NOT EXISTS message_stats (
+            chat_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            day INTEGER NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (chat_id, user_id, day)
+        ) WITHOUT ROWID
+    """
+    _ADD_MESSAGE_COUNT_SQL = """
+        INSERT INTO message_stats (chat_id, user_id, day, count)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(chat_id, user_id, day) DO UPDATE SET
+            count = count + excluded.count
+    """
+    _CREATE_USER_PRESENCE_SQL = """
+        CREATE TABLE IF NOT EXISTS user_presence (
+            chat_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            first_seen INTEGER NOT NULL,
+            PRIMARY KEY (chat_id, user_id)
+        ) WITHOUT ROWID
+    """
+    _INSERT_PRESENCE_SQL = """
+        INSERT INTO user_presence (chat_id, user_id, first_seen)
+        VALUES (?, ?, ?)
+        ON CONFLICT(chat_id, user_id) DO NOTHING
+    """
 
     def __init__(
         self,
@@ -17,17 +116,67 @@ class UserStorage:
     ):
         self.db_path = Path(db_path)
         self.legacy_json_path = Path(legacy_json_path) if legacy_json_path else None
-        logging.debug("UserStorage initialised with db=%s", self.db_path)
+        logger.debug("UserStorage initialised with db=%s", self.db_path)
+        self._lock = threading.Lock()
+        # One autocommit connection for the lifetime of the storage, shared
+        # between threads under the lock. Transactions are opened explicitly
+        # by ``_write``.
+        self._conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL;")
+        # With WAL, NORMAL skips the fsync on every commit: a power loss may drop
+        # the last transactions but cannot corrupt the database.
+        self._conn.execute("PRAGMA synchronous=NORMAL;")
+        self._conn.execute("PRAGMA temp_store=MEMORY;")
+        self._conn.execute(f"PRAGMA cache_size=-{self.WRITER_CACHE_KIB};")
+        self._conn.execute(f"PRAGMA mmap_size={self.MMAP_SIZE};")
         self._initialise_database()
         self._import_legacy_json_if_needed()
+        # username <-> id lookups, including misses, kept in LRU order. Writes
+        # drop the entries they contradict and bump the version, so a lookup
+        # racing with a write does not cache what it read before the commit.
+        self._lookup_lock = threading.Lock()
+        self._lookup_version = 0
+        self._id_by_username: "OrderedDict[str, Optional[int]]" = OrderedDict()
+        self._username_by_id: "OrderedDict[int, Optional[str]]" = OrderedDict()
+        reader_uri = f"{self.db_path.resolve().as_uri()}?mode=ro"
+        self._readers: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        for _ in range(self.READER_COUNT):
+            reader = sqlite3.connect(reader_uri, uri=True, check_same_thread=False)
+            # Readers share the mapped pages through the OS page cache.
+            reader.execute(f"PRAGMA mmap_size={self.MMAP_SIZE};")
+            self._readers.put(reader)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+        for _ in range(self.READER_COUNT):
+            self._readers.get().close()
 
-    def _get_connection(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        conn.execute("PRAGMA journal_mode=WAL;")
-        return conn
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """Run the block as one ``BEGIN IMMEDIATE`` transaction on the writer."""
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
 
     def _initialise_database(self):
-        with self._get_connection() as conn:
+        with self._write() as conn:
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS users (
@@ -49,42 +198,64 @@ class UserStorage:
                 )
                 """
             )
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS message_stats (
-                    chat_id INTEGER NOT NULL,
-                    user_id INTEGER NOT NULL,
-                    date TEXT NOT NULL,
-                    count INTEGER NOT NULL DEFAULT 0,
-                    PRIMARY KEY (chat_id, user_id, date)
-                )
-                """
-            )
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS user_presence (
-                    chat_id INTEGER NOT NULL,
-                    user_id INTEGER NOT NULL,
-                    first_seen TEXT NOT NULL,
-                    PRIMARY KEY (chat_id, user_id)
-                )
-                """
-            )
+            conn.execute(self._CREATE_MESSAGE_STATS_SQL)
+            conn.execute(self._CREATE_USER_PRESENCE_SQL)
 
             # Backwards compatibility for display_name column
             cursor = conn.execute("PRAGMA table_info(chat_users)")
             columns = {row[1] for row in cursor.fetchall()}
             if "display_name" not in columns:
-                logging.info("Adding display_name column to chat_users table")
+                logger.info("Adding display_name column to chat_users table")
                 conn.execute(
                     "ALTER TABLE chat_users ADD COLUMN display_name TEXT"
                 )
             if "archived" not in columns:
-                logging.info("Adding archived column to chat_users table")
+                logger.info("Adding archived column to chat_users table")
                 conn.execute(
                     "ALTER TABLE chat_users ADD COLUMN archived INTEGER DEFAULT 0"
                 )
-        logging.debug("UserStorage database initialised at %s", self.db_path)
+
+            cursor = conn.execute("PRAGMA table_info(message_stats)")
+            if "day" not in {row[1] for row in cursor.fetchall()}:
+                logger.info("Converting message_stats dates to day numbers")
+                conn.execute("ALTER TABLE message_stats RENAME TO message_stats_by_date")
+                conn.execute(self._CREATE_MESSAGE_STATS_SQL)
+                conn.execute(
+                    """
+                    INSERT INTO message_stats (chat_id, user_id, day, count)
+                    SELECT chat_id, user_id,
+                        CAST(julianday(date) - 2440587.5 AS INTEGER), SUM(count)
+                    FROM message_stats_by_date
+                    WHERE julianday(date) IS NOT NULL
+                    GROUP BY 1, 2, 3
+                    """
+                )
+                # Also drops the old idx_message_stats_user_date index.
+                conn.execute("DROP TABLE message_stats_by_date")
+
+            cursor = conn.execute("PRAGMA table_info(user_presence)")
+            if {row[1]: row[2] for row in cursor.fetchall()}["first_seen"] != "INTEGER":
+                logger.info("Converting user_presence timestamps to epoch seconds")
+                conn.execute("ALTER TABLE user_presence RENAME TO user_presence_iso")
+                conn.execute(self._CREATE_USER_PRESENCE_SQL)
+                conn.execute(
+                    """
+                    INSERT INTO user_presence (chat_id, user_id, first_seen)
+                    SELECT chat_id, user_id, CAST(strftime('%s', first_seen) AS INTEGER)
+                    FROM user_presence_iso
+                    WHERE strftime('%s', first_seen) IS NOT NULL
+                    """
+                )
+                conn.execute("DROP TABLE user_presence_iso")
+
+            # The username/id fallbacks on chat_users no longer scan the table.
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_chat_users_username ON chat_users(username)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_chat_users_user ON chat_users(user_id)"
+            )
+        logger.debug("UserStorage database initialised at %s", self.db_path)
 
     def _normalise_structure(self, raw: object) -> Dict[str, Any]:
         def normalise_username(value: str) -> str:
@@ -125,45 +296,51 @@ class UserStorage:
         if not self.legacy_json_path or not self.legacy_json_path.exists():
             return
 
-        logging.info(
+        logger.info(
             "Legacy users json detected at %s; beginning import to sqlite",
             self.legacy_json_path,
         )
         try:
-            with self.legacy_json_path.open("r", encoding="utf-8") as f:
-                raw = json.load(f)
+            raw = _json_loads(self.legacy_json_path.read_bytes())
         except Exception as exc:
-            logging.exception("Failed to read legacy users json %s: %s", self.legacy_json_path, exc)
+            logger.exception("Failed to read legacy users json %s: %s", self.legacy_json_path, exc)
             return
 
         data = self._normalise_structure(raw)
-        imported_rows = 0
-        with self._lock:
-            with self._get_connection() as conn:
-                for username, user_id in data.get("global", {}).items():
-                    self._upsert_user_in_conn(conn, user_id, username)
-                    imported_rows += 1
-                for chat_id, users in data.get("chats", {}).items():
-                    try:
-                        normalised_chat_id = int(chat_id)
-                    except (TypeError, ValueError):
-                        logging.debug("Skipping legacy chat id %s - not an integer", chat_id)
-                        continue
-                    for username, user_id in users.items():
-                        self._upsert_user_in_conn(conn, user_id, username, normalised_chat_id)
-                        imported_rows += 1
+        # (username, user_id) for users, (chat_id, username, user_id, None) for chat_users
+        user_rows: List[Tuple[str, int]] = []
+        chat_rows: List[Tuple[int, str, int, None]] = []
+        for username, user_id in data.get("global", {}).items():
+            if username:
+                user_rows.append((username, user_id))
+        for chat_id, users in data.get("chats", {}).items():
+            try:
+                normalised_chat_id = int(chat_id)
+            except (TypeError, ValueError):
+                logger.debug("Skipping legacy chat id %s - not an integer", chat_id)
+                continue
+            for username, user_id in users.items():
+                if username:
+                    user_rows.append((username, user_id))
+                    chat_rows.append((normalised_chat_id, username, user_id, None))
+
+        with self._write() as conn:
+            conn.executemany(self._UPSERT_USER_SQL, user_rows)
+            conn.executemany(self._UPSERT_CHAT_USER_SQL, chat_rows)
+        # Chat entries also land in the global table, so user_rows counts everything.
+        imported_rows = len(user_rows)
 
         backup_path = self.legacy_json_path.with_name("olduserbd.json.bak")
         try:
             self.legacy_json_path.replace(backup_path)
-            logging.info(
+            logger.info(
                 "Imported %s legacy users into %s and renamed json to %s",
                 imported_rows,
                 self.db_path,
                 backup_path,
             )
         except Exception as exc:
-            logging.exception(
+            logger.exception(
                 "Imported legacy users but failed to rename %s to %s: %s",
                 self.legacy_json_path,
                 backup_path,
@@ -174,6 +351,42 @@ class UserStorage:
     def _normalise_username(username: str) -> str:
         return username.lower().lstrip("@")
 
+    def _cached_lookup(self, cache: "OrderedDict", key: Any) -> Tuple[Any, int]:
+        with self._lookup_lock:
+            value = cache.get(key, _MISSING)
+            if value is not _MISSING:
+                cache.move_to_end(key)
+            return value, self._lookup_version
+
+    def _store_lookup(self, cache: "OrderedDict", key: Any, value: Any, version: int) -> None:
+        with self._lookup_lock:
+            if version != self._lookup_version:
+                return
+            cache[key] = value
+            cache.move_to_end(key)
+            if len(cache) > self.LOOKUP_CACHE_SIZE:
+                cache.popitem(last=False)
+
+    def _forget_lookups(self, pairs: Iterable[Tuple[str, int]]) -> None:
+        """Drop cached lookups contradicted by committed ``(username, user_id)`` pairs."""
+        with self._lookup_lock:
+            self._lookup_version += 1
+            for username, user_id in pairs:
+                old_id = self._id_by_username.get(username, _MISSING)
+                if old_id is not _MISSING and old_id != user_id:
+                    del self._id_by_username[username]
+                    self._username_by_id.pop(old_id, None)
+                old_username = self._username_by_id.get(user_id, _MISSING)
+                if old_username is not _MISSING and old_username != username:
+                    del self._username_by_id[user_id]
+                    self._id_by_username.pop(old_username, None)
+
+    def _clear_lookups(self) -> None:
+        with self._lookup_lock:
+            self._lookup_version += 1
+            self._id_by_username.clear()
+            self._username_by_id.clear()
+
     def _upsert_user_in_conn(
         self,
         conn: sqlite3.Connection,
@@ -181,46 +394,26 @@ class UserStorage:
         username: Optional[str],
         chat_id: Optional[int] = None,
         display_name: Optional[str] = None,
-    ):
-        if username:
-            normalised_username = self._normalise_username(username)
-            conn.execute(
-                """
-                UPDATE users
-                SET username = ?
-                WHERE user_id = ?
-                """,
-                (normalised_username, user_id),
-            )
-            conn.execute(
-                """
-                INSERT INTO users (username, user_id)
-                VALUES (?, ?)
-                ON CONFLICT(username) DO UPDATE SET user_id = excluded.user_id
-                """,
-                (normalised_username, user_id),
-            )
+    ) -> Optional[Tuple[str, int]]:
+        """Upsert the user and return the stored ``(username, user_id)`` pair.
 
-        if chat_id is not None and username:
+        Callers pass the pair to :meth:`_forget_lookups` once the transaction
+        has committed.
+        """
+        if not username:
+            return None
+        normalised_username = self._normalise_username(username)
+        conn.execute(self._RELEASE_USERNAME_SQL, (normalised_username, user_id))
+        conn.execute(self._UPSERT_USER_SQL, (normalised_username, user_id))
+        if chat_id is not None:
             conn.execute(
-                """
-                UPDATE chat_users
-                SET username = ?, display_name = COALESCE(?, display_name), archived = 0
-                WHERE chat_id = ? AND user_id = ?
-                """,
-                (normalised_username, display_name, chat_id, user_id),
+                self._RELEASE_CHAT_USERNAME_SQL, (chat_id, normalised_username, user_id)
             )
             conn.execute(
-                """
-                INSERT INTO chat_users (chat_id, username, user_id, display_name, archived)
-                VALUES (?, ?, ?, ?, 0)
-                ON CONFLICT(chat_id, username) DO UPDATE SET
-                    user_id = excluded.user_id,
-                    display_name = COALESCE(excluded.display_name, chat_users.display_name),
-                    archived = 0
-                """,
+                self._UPSERT_CHAT_USER_SQL,
                 (chat_id, normalised_username, user_id, display_name),
             )
+        return normalised_username, user_id
 
     def upsert_user(
         self,
@@ -230,108 +423,102 @@ class UserStorage:
         display_name: Optional[str] = None,
     ):
         if not username and not display_name:
-            logging.debug(
+            logger.debug(
                 "Skipping upsert for user_id=%s due to empty username and display name",
                 user_id,
             )
             return
 
-        with self._lock:
-            logging.debug(
-                "Upserting user '%s' -> %s (chat_id=%s)",
-                username,
-                user_id,
-                chat_id,
-            )
-            with self._get_connection() as conn:
-                self._upsert_user_in_conn(conn, user_id, username, chat_id, display_name)
+        with self._write() as conn:
+            pair = self._upsert_user_in_conn(conn, user_id, username, chat_id, display_name)
+        if pair is not None:
+            self._forget_lookups([pair])
 
     def get_id_by_username(self, username: str) -> Optional[int]:
         normalised_username = self._normalise_username(username)
-        with self._lock:
-            with self._get_connection() as conn:
-                cursor = conn.execute(
-                    "SELECT user_id FROM users WHERE username = ?",
-                    (normalised_username,),
-                )
-                row = cursor.fetchone()
-                if row:
-                    user_id = row[0]
-                    logging.debug("Lookup username '%s' -> %s (global)", normalised_username, user_id)
-                    return user_id
-
-                cursor = conn.execute(
-                    "SELECT user_id FROM chat_users WHERE username = ? LIMIT 1",
-                    (normalised_username,),
-                )
-                row = cursor.fetchone()
-                if row:
-                    user_id = row[0]
-                    logging.debug(
-                        "Lookup username '%s' -> %s (chat-specific)",
-                        normalised_username,
-                        user_id,
-                    )
-                    return user_id
-
-        logging.debug("Lookup username '%s' -> not found", normalised_username)
+        cached, version = self._cached_lookup(self._id_by_username, normalised_username)
+        if cached is not _MISSING:
+            return cached
+        user_id = self._query_id_by_username(normalised_username)
+        self._store_lookup(self._id_by_username, normalised_username, user_id, version)
+        return user_id
+
+    def _query_id_by_username(self, normalised_username: str) -> Optional[int]:
+        with self._reader() as conn:
+            cursor = conn.execute(
+                "SELECT user_id FROM users WHERE username = ?",
+                (normalised_username,),
+            )
+            row = cursor.fetchone()
+            if row:
+                return row[0]
+
+            cursor = conn.execute(
+                "SELECT user_id FROM chat_users WHERE username = ? LIMIT 1",
+                (normalised_username,),
+            )
+            row = cursor.fetchone()
+            if row:
+                return row[0]
+
+        logger.debug("Lookup username '%s' -> not found", normalised_username)
         return None
 
     def get_username_by_id(self, user_id: int) -> Optional[str]:
-        with self._lock:
-            with self._get_connection() as conn:
-                cursor = conn.execute(
-                    "SELECT username FROM users WHERE user_id = ?",
-                    (user_id,),
-                )
-                row = cursor.fetchone()
-                if row:
-                    username = row[0]
-                    logging.debug("Lookup user_id=%s -> username '%s' (global)", user_id, username)
-                    return username
-
-                cursor = conn.execute(
-                    "SELECT username FROM chat_users WHERE user_id = ? LIMIT 1",
-                    (user_id,),
-                )
-                row = cursor.fetchone()
-                if row:
-                    username = row[0]
-                    logging.debug("Lookup user_id=%s -> username '%s' (chat-specific)", user_id, username)
-                    return username
+        cached, version = self._cached_lookup(self._username_by_id, user_id)
+        if cached is not _MISSING:
+            return cached
+        username = self._query_username_by_id(user_id)
+        self._store_lookup(self._username_by_id, user_id, username, version)
+        return username
+
+    def _query_username_by_id(self, user_id: int) -> Optional[str]:
+        with self._reader() as conn:
+            cursor = conn.execute(
+                "SELECT username FROM users WHERE user_id = ?",
+                (user_id,),
+            )
+            row = cursor.fetchone()
+            if row:
+                return row[0]
+
+            cursor = conn.execute(
+                "SELECT username FROM chat_users WHERE user_id = ? LIMIT 1",
+                (user_id,),
+            )
+            row = cursor.fetchone()
+            if row:
+                return row[0]
 
-        logging.debug("No username found for user_id=%s", user_id)
+        logger.debug("No username found for user_id=%s", user_id)
         return None
 
     def get_random_user(self, chat_id: Optional[int]) -> Optional[Tuple[int, str, Optional[str]]]:
         if chat_id is None:
-            logging.debug("Random user requested without chat_id")
+            logger.debug("Random user requested without chat_id")
             return None
 
-        with self._lock:
-            with self._get_connection() as conn:
-                cursor = conn.execute(
-                    """
-                    SELECT user_id, username, display_name FROM chat_users
+        with self._reader() as conn:
+            # Skip to a random position in the chat's index range instead of
+            # sorting every member by RANDOM().
+            cursor = conn.execute(
+                """
+                SELECT user_id, username, display_name FROM chat_users
+                WHERE chat_id = ?
+                LIMIT 1 OFFSET (
+                    SELECT abs(random()) % max(COUNT(*), 1) FROM chat_users
                     WHERE chat_id = ?
-                    ORDER BY RANDOM()
-                    LIMIT 1
-                    """,
-                    (chat_id,),
                 )
-                row = cursor.fetchone()
+                """,
+                (chat_id, chat_id),
+            )
+            row = cursor.fetchone()
 
         if not row:
-            logging.debug("Random user requested for chat_id=%s but none stored", chat_id)
+            logger.debug("Random user requested for chat_id=%s but none stored", chat_id)
             return None
 
         user_id, username, display_name = row
-        logging.debug(
-            "Random user selected for chat_id=%s: %s -> %s",
-            chat_id,
-            username,
-            user_id,
-        )
         return user_id, username, display_name
 
     def record_message_activity(
@@ -344,35 +531,101 @@ class UserStorage:
         occurred_at: Optional[datetime],
     ) -> None:
         if chat_id is None:
-            logging.debug("record_message_activity called without chat_id")
+            logger.debug("record_message_activity called without chat_id")
             return
 
-        timestamp = occurred_at or datetime.utcnow()
-        if timestamp.tzinfo is not None:
-            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+        self.record_message_activities(
+            [MessageActivity(chat_id, user_id, username, display_name, occurred_at)]
+        )
 
-        date_str = timestamp.date().isoformat()
+    def record_message_activities(self, activities: Iterable[MessageActivity]) -> None:
+        """Record a batch of messages in a single transaction.
 
-        with self._lock:
-            with self._get_connection() as conn:
-                self._upsert_user_in_conn(conn, user_id, username, chat_id, display_name)
-                conn.execute(
-                    """
-                    INSERT INTO message_stats (chat_id, user_id, date, count)
-                    VALUES (?, ?, ?, 1)
-                    ON CONFLICT(chat_id, user_id, date) DO UPDATE SET
-                        count = count + 1
-                    """,
-                    (chat_id, user_id, date_str),
-                )
-                conn.execute(
-                    """
-                    INSERT INTO user_presence (chat_id, user_id, first_seen)
-                    VALUES (?, ?, ?)
-                    ON CONFLICT(chat_id, user_id) DO NOTHING
-                    """,
-                    (chat_id, user_id, timestamp.isoformat()),
-                )
+        Messages are folded per chat, user and day first, so a burst from one
+        user costs one profile upsert and one counter update instead of one each
+        per message.
+        """
+        # (chat_id, user_id, day number) -> number of messages
+        counts: Dict[Tuple[int, int, int], int] = {}
+        # (chat_id, user_id) -> earliest timestamp in the batch, in epoch seconds
+        first_seen: Dict[Tuple[int, int], int] = {}
+        # (chat_id, user_id) -> (username, display_name), ordered by last message
+        profiles: Dict[Tuple[int, int], Tuple[Optional[str], Optional[str]]] = {}
+        for activity in activities:
+            chat_id = activity.chat_id
+            if chat_id is None:
+                logger.debug("Skipping batched activity without chat_id")
+                continue
+            timestamp = activity.occurred_at or datetime.utcnow()
+            if timestamp.tzinfo is not None:
+                timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+
+            member = (chat_id, activity.user_id)
+            day = (chat_id, activity.user_id, _day_number(timestamp.date()))
+            counts[day] = counts.get(day, 0) + 1
+            if member not in first_seen:
+                first_seen[member] = int(timestamp.replace(tzinfo=timezone.utc).timestamp())
+            previous = profiles.pop(member, None)
+            display_name = activity.display_name
+            if display_name is None and previous is not None:
+                # Matches COALESCE(?, display_name) when upserting one by one.
+                display_name = previous[1]
+            profiles[member] = (activity.username, display_name)
+
+        if not counts:
+            return
+
+        # The end state _upsert_user_in_conn would reach one profile at a time:
+        # the last claim wins for every account and for every username, so the
+        # rows below are one-to-one and can be released and upserted in bulk.
+        names_by_user: Dict[int, str] = {}
+        users_by_name: Dict[str, int] = {}
+        chat_names: Dict[Tuple[int, int], Tuple[str, Optional[str]]] = {}
+        chat_owners: Dict[Tuple[int, str], int] = {}
+        for (chat_id, user_id), (username, display_name) in profiles.items():
+            if not username:
+                continue
+            name = self._normalise_username(username)
+            previous_name = names_by_user.pop(user_id, None)
+            if previous_name is not None:
+                del users_by_name[previous_name]
+            previous_owner = users_by_name.pop(name, None)
+            if previous_owner is not None:
+                del names_by_user[previous_owner]
+            names_by_user[user_id] = name
+            users_by_name[name] = user_id
+
+            previous_chat_name = chat_names.pop((chat_id, user_id), None)
+            if previous_chat_name is not None:
+                del chat_owners[(chat_id, previous_chat_name[0])]
+            previous_chat_owner = chat_owners.pop((chat_id, name), None)
+            if previous_chat_owner is not None:
+                del chat_names[(chat_id, previous_chat_owner)]
+            chat_names[(chat_id, user_id)] = (name, display_name)
+            chat_owners[(chat_id, name)] = user_id
+
+        user_rows = [(name, user_id) for user_id, name in names_by_user.items()]
+        chat_rows = [
+            (chat_id, name, user_id, display_name)
+            for (chat_id, user_id), (name, display_name) in chat_names.items()
+        ]
+        with self._write() as conn:
+            conn.executemany(self._RELEASE_USERNAME_SQL, user_rows)
+            conn.executemany(self._UPSERT_USER_SQL, user_rows)
+            conn.executemany(
+                self._RELEASE_CHAT_USERNAME_SQL,
+                [(chat_id, name, user_id) for chat_id, name, user_id, _ in chat_rows],
+            )
+            conn.executemany(self._UPSERT_CHAT_USER_SQL, chat_rows)
+            conn.executemany(
+                self._ADD_MESSAGE_COUNT_SQL,
+                [(*day, count) for day, count in counts.items()],
+            )
+            conn.executemany(
+                self._INSERT_PRESENCE_SQL,
+                [(*member, seen) for member, seen in first_seen.items()],
+            )
+        self._forget_lookups(user_rows)
 
     def get_message_statistics(
         self,
@@ -383,46 +636,30 @@ class UserStorage:
     ) -> Dict[str, int]:
         ref = reference or datetime.utcnow()
         ref_date = ref.date()
-        day_key = ref_date.isoformat()
-        week_start = (ref_date - timedelta(days=6)).isoformat()
-        month_start = ref_date.replace(day=1).isoformat()
+        day_key = _day_number(ref_date)
+        week_start = day_key - 6
+        month_start = day_key - ref_date.day + 1
 
-        with self._lock:
-            with self._get_connection() as conn:
-                day_row = conn.execute(
-                    """
-                    SELECT count FROM message_stats
-                    WHERE chat_id = ? AND user_id = ? AND date = ?
-                    """,
-                    (chat_id, user_id, day_key),
-                ).fetchone()
-                week_row = conn.execute(
-                    """
-                    SELECT COALESCE(SUM(count), 0) FROM message_stats
-                    WHERE chat_id = ? AND user_id = ? AND date >= ?
-                    """,
-                    (chat_id, user_id, week_start),
-                ).fetchone()
-                month_row = conn.execute(
-                    """
-                    SELECT COALESCE(SUM(count), 0) FROM message_stats
-                    WHERE chat_id = ? AND user_id = ? AND date >= ?
-                    """,
-                    (chat_id, user_id, month_start),
-                ).fetchone()
-                total_row = conn.execute(
-                    """
-                    SELECT COALESCE(SUM(count), 0) FROM message_stats
-                    WHERE chat_id = ? AND user_id = ?
-                    """,
-                    (chat_id, user_id),
-                ).fetchone()
+        with self._reader() as conn:
+            # One pass over the user's rows; SUM over no matching rows is NULL.
+            day, week, month, total = conn.execute(
+                """
+                SELECT
+                    SUM(CASE WHEN day = ? THEN count END),
+                    SUM(CASE WHEN day >= ? THEN count END),
+                    SUM(CASE WHEN day >= ? THEN count END),
+                    SUM(count)
+                FROM message_stats
+                WHERE chat_id = ? AND user_id = ?
+                """,
+                (day_key, week_start, month_start, chat_id, user_id),
+            ).fetchone()
 
         return {
-            "day": day_row[0] if day_row else 0,
-            "week": week_row[0] if week_row else 0,
-            "month": month_row[0] if month_row else 0,
-            "total": total_row[0] if total_row else 0,
+            "day": day or 0,
+            "week": week or 0,
+            "month": month or 0,
+            "total": total or 0,
         }
 
     def get_top_users(
@@ -441,15 +678,16 @@ class UserStorage:
         filters = ["ms.chat_id = ?"]
         params: list[Any] = [chat_id]
 
+        ref_day = _day_number(ref_date)
         if period == "day":
-            filters.append("ms.date = ?")
-            params.append(ref_date.isoformat())
+            filters.append("ms.day = ?")
+            params.append(ref_day)
         elif period == "week":
-            filters.append("ms.date >= ?")
-            params.append((ref_date - timedelta(days=6)).isoformat())
+            filters.append("ms.day >= ?")
+            params.append(ref_day - 6)
         elif period == "month":
-            filters.append("ms.date >= ?")
-            params.append(ref_date.replace(day=1).isoformat())
+            filters.append("ms.day >= ?")
+            params.append(ref_day - ref_date.day + 1)
         elif period in {"total", "all"}:
             pass
         else:
@@ -475,10 +713,9 @@ class UserStorage:
             LIMIT ?
         """
 
-        with self._lock:
-            with self._get_connection() as conn:
-                cursor = conn.execute(query, (*params, limit))
-                rows = cursor.fetchall()
+        with self._reader() as conn:
+            cursor = conn.execute(query, (*params, limit))
+            rows = cursor.fetchall()
 
         results: List[Dict[str, Any]] = []
         for user_id, total_count, display_name, chat_username, global_username in rows:
@@ -495,56 +732,43 @@ class UserStorage:
         return results
 
     def get_first_seen(self, chat_id: int, user_id: int) -> Optional[datetime]:
-        with self._lock:
-            with self._get_connection() as conn:
-                row = conn.execute(
-                    """
-                    SELECT first_seen FROM user_presence
-                    WHERE chat_id = ? AND user_id = ?
-                    """,
-                    (chat_id, user_id),
-                ).fetchone()
-
-        if not row or not row[0]:
-            return None
+        with self._reader() as conn:
+            row = conn.execute(
+                """
+                SELECT first_seen FROM user_presence
+                WHERE chat_id = ? AND user_id = ?
+                """,
+                (chat_id, user_id),
+            ).fetchone()
 
-        try:
-            return datetime.fromisoformat(row[0])
-        except ValueError:
-            logging.debug(
-                "Failed to parse first_seen timestamp '%s' for chat_id=%s user_id=%s",
-                row[0],
-                chat_id,
-                user_id,
-            )
+        if not row:
             return None
+        return datetime.utcfromtimestamp(row[0])
 
     def get_display_name(self, chat_id: int, user_id: int) -> Optional[str]:
-        with self._lock:
-            with self._get_connection() as conn:
-                row = conn.execute(
-                    """
-                    SELECT display_name FROM chat_users
-                    WHERE chat_id = ? AND user_id = ?
-                    """,
-                    (chat_id, user_id),
-                ).fetchone()
+        with self._reader() as conn:
+            row = conn.execute(
+                """
+                SELECT display_name FROM chat_users
+                WHERE chat_id = ? AND user_id = ?
+                """,
+                (chat_id, user_id),
+            ).fetchone()
 
         if row and row[0]:
             return row[0]
         return None
 
     def get_chat_user_ids(self, chat_id: int) -> List[int]:
-        with self._lock:
-            with self._get_connection() as conn:
-                rows = conn.execute(
-                    """
-                    SELECT user_id FROM chat_users
-                    WHERE chat_id = ? AND COALESCE(archived, 0) = 0
-                    ORDER BY user_id ASC
-                    """,
-                    (chat_id,),
-                ).fetchall()
+        with self._reader() as conn:
+            rows = conn.execute(
+                """
+                SELECT user_id FROM chat_users
+                WHERE chat_id = ? AND COALESCE(archived, 0) = 0
+                ORDER BY user_id ASC
+                """,
+                (chat_id,),
+            ).fetchall()
 
         unique_ids: List[int] = []
         seen: set[int] = set()
@@ -559,18 +783,17 @@ class UserStorage:
     def get_chat_users(
         self, chat_id: int, *, include_archived: bool = False
     ) -> List[Dict[str, Any]]:
-        with self._lock:
-            with self._get_connection() as conn:
-                query = """
-                    SELECT user_id, username, display_name, archived
-                    FROM chat_users
-                    WHERE chat_id = ?
-                """
-                params: list[Any] = [chat_id]
-                if not include_archived:
-                    query += " AND COALESCE(archived, 0) = 0"
-
-                rows = conn.execute(query, params).fetchall()
+        with self._reader() as conn:
+            query = """
+                SELECT user_id, username, display_name, archived
+                FROM chat_users
+                WHERE chat_id = ?
+            """
+            params: list[Any] = [chat_id]
+            if not include_archived:
+                query += " AND COALESCE(archived, 0) = 0"
+
+            rows = conn.execute(query, params).fetchall()
 
         results: List[Dict[str, Any]] = []
         for user_id, username, display_name, archived in rows:
@@ -585,27 +808,25 @@ class UserStorage:
         return results
 
     def set_archived(self, chat_id: int, user_id: int, archived: bool) -> None:
-        with self._lock:
-            with self._get_connection() as conn:
-                conn.execute(
-                    """
-                    UPDATE chat_users
-                    SET archived = ?
-                    WHERE chat_id = ? AND user_id = ?
-                    """,
-                    (1 if archived else 0, chat_id, user_id),
-                )
+        with self._write() as conn:
+            conn.execute(
+                """
+                UPDATE chat_users
+                SET archived = ?
+                WHERE chat_id = ? AND user_id = ?
+                """,
+                (1 if archived else 0, chat_id, user_id),
+            )
 
     def is_archived(self, chat_id: int, user_id: int) -> bool:
-        with self._lock:
-            with self._get_connection() as conn:
-                row = conn.execute(
-                    """
-                    SELECT archived FROM chat_users
-                    WHERE chat_id = ? AND user_id = ?
-                    """,
-                    (chat_id, user_id),
-                ).fetchone()
+        with self._reader() as conn:
+            row = conn.execute(
+                """
+                SELECT archived FROM chat_users
+                WHERE chat_id = ? AND user_id = ?
+                """,
+                (chat_id, user_id),
+            ).fetchone()
 
         if not row:
             return False
@@ -615,18 +836,18 @@ class UserStorage:
             return False
 
     def delete_chat_user_data(self, chat_id: int, user_id: int) -> None:
-        with self._lock:
-            with self._get_connection() as conn:
-                conn.execute(
-                    "DELETE FROM chat_users WHERE chat_id = ? AND user_id = ?",
-                    (chat_id, user_id),
-                )
-                conn.execute(
-                    "DELETE FROM user_presence WHERE chat_id = ? AND user_id = ?",
-                    (chat_id, user_id),
-                )
-                conn.execute(
-                    "DELETE FROM message_stats WHERE chat_id = ? AND user_id = ?",
-                    (chat_id, user_id),
-                )
-
+        with self._write() as conn:
+            conn.execute(
+                "DELETE FROM chat_users WHERE chat_id = ? AND user_id = ?",
+                (chat_id, user_id),
+            )
+            conn.execute(
+                "DELETE FROM user_presence WHERE chat_id = ? AND user_id = ?",
+                (chat_id, user_id),
+            )
+            conn.execute(
+                "DELETE FROM message_stats WHERE chat_id = ? AND user_id = ?",
+                (chat_id, user_id),
+            )
+        # Fallback lookups through chat_users may have changed for any name.
+        self._clear_lookups()
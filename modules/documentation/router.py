@@ -1,7 +1,8 @@
+import functools
+
 from aiogram import F, Router
 from aiogram.filters import Command
-from aiogram.types import CallbackQuery, InlineKeyboardMarkup, Message
-from aiogram.utils.keyboard import InlineKeyboardBuilder
+from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, Message
 
 from utils.localization import gettext, language_from_message, normalize_language_code
 
@@ -154,58 +155,72 @@ SECTION_ORDER = [
     "settings",
 ]
 
+# Callback data of each section button, and the section it opens.
+_SECTION_BY_CALLBACK = {f"{CALLBACK_PREFIX}:{key}": key for key in SECTION_ORDER}
+
+# (language, section) -> rendered text and keyboard. Locale files are read once
+# per process, so entries never go stale; there are at most a few languages.
+_RENDER_CACHE: dict[tuple[str, str], tuple[str, InlineKeyboardMarkup]] = {}
 
+
+# Keys are fixed and languages few; translations do not change while running.
+@functools.lru_cache(maxsize=None)
 def _translate(key: str, language: str) -> str:
     default_value = DEFAULT_TEXTS[key]
     return gettext(key, language=language, default=default_value)
 
 
 def build_keyboard(active_key: str, language: str) -> InlineKeyboardMarkup:
-    builder = InlineKeyboardBuilder()
-    for key in SECTION_ORDER:
+    buttons = []
+    for callback_data, key in _SECTION_BY_CALLBACK.items():
         section = SECTIONS[key]
         label = _translate(section["button_key"], language)
         if key == active_key:
             label = f"• {label}"
-        builder.button(text=label, callback_data=f"{CALLBACK_PREFIX}:{key}")
-    builder.adjust(2)
-    return builder.as_markup()
+        buttons.append(InlineKeyboardButton(text=label, callback_data=callback_data))
+    rows = [buttons[index:index + 2] for index in range(0, len(buttons), 2)]
+    return InlineKeyboardMarkup(inline_keyboard=rows)
 
 
 def render_section(key: str, language: str) -> str:
     section = SECTIONS[key]
     header = f"<b>{_translate(section['title_key'], language)}</b>\n"
     body = "\n".join(
-        _translate(content_key, language) for content_key in section["content_keys"]
+        [_translate(content_key, language) for content_key in section["content_keys"]]
     )
     return f"{header}{body}"
 
 
+def _rendered(key: str, language: str) -> tuple[str, InlineKeyboardMarkup]:
+    cache_key = (language, key)
+    rendered = _RENDER_CACHE.get(cache_key)
+    if rendered is None:
+        rendered = (render_section(key, language), build_keyboard(key, language))
+        _RENDER_CACHE[cache_key] = rendered
+    return rendered
+
+
 @router.message(Command("help"))
 async def command_help(message: Message) -> None:
     active_key = "overview"
     language = language_from_message(message)
-    await message.answer(
-        render_section(active_key, language),
-        reply_markup=build_keyboard(active_key, language),
-    )
+    text, markup = _rendered(active_key, language)
+    await message.answer(text, reply_markup=markup)
 
 
 @router.callback_query(F.data.startswith(f"{CALLBACK_PREFIX}:"))
 async def callback_help(callback: CallbackQuery) -> None:
     language = normalize_language_code(callback.from_user.language_code)
-    key = callback.data.split(":", 1)[1]
-    if key not in SECTIONS:
+    key = _SECTION_BY_CALLBACK.get(callback.data)
+    if key is None:
         await callback.answer(
             _translate("documentation.unknown_section", language), show_alert=True
         )
         return
 
+    text, markup = _rendered(key, language)
     try:
-        await callback.message.edit_text(
-            render_section(key, language),
-            reply_markup=build_keyboard(key, language),
-        )
+        await callback.message.edit_text(text, reply_markup=markup)
     except Exception:
         pass
 
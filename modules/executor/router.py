@@ -6,11 +6,16 @@ import json
 import os
 
 import aiohttp
-from aiogram import F, Bot, Router
+from aiogram import Bot, Router
 from aiogram.filters import Command
 from aiogram.types import Message
 from modules.executor.safe_utils import ast_sanitize
 
+try:  # pragma: no cover - optional dependency
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
 from modules.base import Module
 from utils.chat_access import ChatFeature, chat_access_storage
 from utils.localization import gettext, language_from_message
@@ -20,17 +25,56 @@ JUDGE0_URL = os.getenv("JUDGE0_URL", "http://127.0.0.1:2358")
 JUDGE0_LANG_ID = int(os.getenv("JUDGE0_LANGUAGE_ID", "71"))
 EXEC_MARKER = "🧪 Executor: "
 
+if orjson is not None:
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+else:  # pragma: no cover - optional dependency
+    def _json_dumps(value) -> bytes:
+        return json.dumps(value).encode("utf-8")
+
+    _json_loads = json.loads
+
+
 class ExecutorModule(Module):
     """Handle /exec requests and execute Python code in a remote sandbox."""
 
+    _logger = logging.getLogger(__name__)
+
+    # Submissions reuse pooled keep-alive connections to Judge0.
+    HTTP_CONNECTION_LIMIT = 32
+    HTTP_KEEPALIVE_TIMEOUT = 60
+    HTTP_TIMEOUT = 15
+
     def __init__(self, pass_router=None) -> None:
         super().__init__("executor", priority=60)
-        self._logger = logging.getLogger(__name__)
         self.router = pass_router or Router(name="executor")
+        self._session: aiohttp.ClientSession | None = None
+        self._registered = False
 
     async def register(self, container) -> None:  # type: ignore[override]
+        if self._registered:
+            return
+        self._registered = True
         self.router.message.register(self._handle_exec_command, Command("exec"))
 
+    async def on_shutdown(self) -> None:  # type: ignore[override]
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Created on first use so that it binds to the running event loop. No
+        # await happens in between, so concurrent callers cannot both create one.
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.HTTP_CONNECTION_LIMIT,
+                    keepalive_timeout=self.HTTP_KEEPALIVE_TIMEOUT,
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.HTTP_TIMEOUT),
+            )
+        return self._session
+
     async def _handle_exec_command(self, message: Message, bot: Bot) -> None:
         if not self.enabled:
             return
@@ -55,26 +99,6 @@ class ExecutorModule(Module):
         code = parts[1].strip()
         await self._execute_code(message, code)
 
-    async def _handle_reply_exec(self, message: Message, bot: Bot) -> None:
-        if not self.enabled:
-            return
-
-        if not self._is_chat_allowed(message):
-            await self._notify_blocked(message)
-            return
-
-        reply = message.reply_to_message
-        if reply is None or reply.from_user is None or not reply.from_user.is_bot:
-            return
-        if EXEC_MARKER not in (reply.text or ""):
-            return
-
-        code = (message.text or message.caption or "").strip()
-        if not code:
-            return
-
-        await self._execute_code(message, code)
-
     async def _execute_code(self, message: Message, code: str) -> None:
         lang = language_from_message(message)
         if len(code) > 1000:
@@ -120,12 +144,13 @@ class ExecutorModule(Module):
                 default="(no output)",
             )
 
-        safe_output = html.escape(output)
+        # Truncate before escaping: less text to escape, and no entity is cut.
+        safe_output = html.escape(output[:1800])
         safe_code = html.escape(code[:300])
         reply_text = (
             f"<b>{EXEC_MARKER}</b>\n"
             f"<pre><code>{safe_code}</code></pre>\n"
-            f"<b>Output:</b>\n<pre><code>{safe_output[:1800]}</code></pre>"
+            f"<b>Output:</b>\n<pre><code>{safe_output}</code></pre>"
         )
 
         await message.reply(reply_text, parse_mode="HTML", disable_web_page_preview=True)
@@ -138,13 +163,13 @@ class ExecutorModule(Module):
             "stdin": "",
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{JUDGE0_URL}/submissions?base64_encoded=false&wait=true",
-                json=payload,
-                timeout=15
-            ) as resp:
-                data = await resp.json()
+        session = self._get_session()
+        async with session.post(
+            f"{JUDGE0_URL}/submissions?base64_encoded=false&wait=true",
+            data=_json_dumps(payload),
+            headers={"Content-Type": "application/json"},
+        ) as resp:
+            data = _json_loads(await resp.read())
 
         stdout = data.get("stdout") or ""
         stderr = data.get("stderr") or ""
@@ -1,12 +1,14 @@
 ﻿# safe_utils.py
 from __future__ import annotations
 import ast
+import functools
+import re
 from typing import Tuple
 
 MAX_CODE_LENGTH = 1000
 
 # имена и атрибуты, которые однозначно запрещаем
-BANNED_NAMES = {
+BANNED_NAMES = frozenset({
     "os",
     "sys",
     "subprocess",
@@ -28,9 +30,9 @@ BANNED_NAMES = {
     "locals",
     "vars",
     "object",
-}
+})
 
-BANNED_ATTR_NAMES = {
+BANNED_ATTR_NAMES = frozenset({
     "system",
     "popen",
     "exec",
@@ -44,7 +46,16 @@ BANNED_ATTR_NAMES = {
     "socket",
     "connect",
     "accept",
-}
+})
+
+# dunders used to climb from any object to builtins; matched case-insensitively
+_DUNDER_RE = re.compile(
+    r"__(?:dict|class|mro|subclasses|bases|globals|builtins)__", re.IGNORECASE
+)
+
+
+class _StopInspection(Exception):
+    """Raised by the inspector to stop walking once the code is rejected."""
 
 
 class _ASTInspector(ast.NodeVisitor):
@@ -52,8 +63,9 @@ class _ASTInspector(ast.NodeVisitor):
         self.reason: str | None = None
 
     def _ban(self, reason: str) -> None:
-        if self.reason is None:
-            self.reason = reason
+        # The first reason is the one reported; nothing later can change it.
+        self.reason = reason
+        raise _StopInspection
 
     def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
         self._ban("import_from")
@@ -72,7 +84,7 @@ class _ASTInspector(ast.NodeVisitor):
 
     def visit_Attribute(self, node: ast.Attribute) -> None:
         # catching possible attempts to access dangerous attributes
-        if isinstance(node.attr, str) and node.attr in BANNED_ATTR_NAMES:
+        if node.attr in BANNED_ATTR_NAMES:
             self._ban(f"attr_banned:{node.attr}")
         self.generic_visit(node)
 
@@ -99,19 +111,26 @@ def ast_sanitize(code: str) -> Tuple[bool, str]:
         return False, "empty"
     if len(code) > MAX_CODE_LENGTH:
         return False, "too_long"
+    return _inspect_code(code)
 
+
+# Snippets are often re-run while debugging; each is at most MAX_CODE_LENGTH chars.
+@functools.lru_cache(maxsize=1024)
+def _inspect_code(code: str) -> Tuple[bool, str]:
     try:
         tree = ast.parse(code)
     except SyntaxError as exc:
         return False, f"syntax_error:{exc}"
 
     inspector = _ASTInspector()
-    inspector.visit(tree)
+    try:
+        inspector.visit(tree)
+    except _StopInspection:
+        pass
     if inspector.reason:
         return False, inspector.reason
 
-    src = code.lower()
-    if "__dict__" in src or "__class__" in src or "__mro__" in src:
+    if _DUNDER_RE.search(code):
         return False, "dunder_usage"
 
     return True, ""
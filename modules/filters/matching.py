@@ -0,0 +1,145 @@
+"""Pattern matching helpers shared by the filter service and middleware."""
+
+from __future__ import annotations
+
+import functools
+import logging
+import re
+from typing import Iterable, List, Optional, Tuple
+
+try:  # pragma: no cover - optional dependency
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional dependency
+    ahocorasick = None
+
+
+@functools.lru_cache(maxsize=4096)
+def compile_pattern(pattern: str) -> Optional[re.Pattern]:
+    """Compile a regex filter once per process.
+
+    Invalid patterns are cached as ``None`` so they are reported once and then
+    skipped on every following message.
+    """
+    try:
+        return re.compile(pattern, re.IGNORECASE)
+    except re.error:
+        logging.exception("Invalid regex filter skipped pattern='%s'", pattern)
+        return None
+
+
+# Constructs whose meaning depends on group numbering or the pattern start.
+_UNION_UNSAFE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(|\(\?[aiLmsux]+\)")
+
+
+def _can_join_union(pattern: str, compiled: re.Pattern) -> bool:
+    return not compiled.groupindex and _UNION_UNSAFE.search(pattern) is None
+
+
+class RegexMatcher:
+    """Evaluate the regex triggers of a chat with a single pre-check pass.
+
+    Compatible patterns are joined into one alternation that is searched first;
+    when it finds nothing, none of its members can match and they are skipped.
+    Patterns relying on group numbers, named groups or inline global flags keep
+    being searched on their own.
+    """
+
+    def __init__(self, triggers: Iterable[Tuple[str, str]]) -> None:
+        # (trigger_key, pattern, compiled, in_union) in definition order
+        entries = []
+        union_parts = []
+        for trigger_key, pattern in triggers:
+            compiled = compile_pattern(pattern)
+            if compiled is None:
+                continue
+            in_union = _can_join_union(pattern, compiled)
+            if in_union:
+                union_parts.append(f"(?:{pattern})")
+            entries.append((trigger_key, pattern, compiled, in_union))
+
+        union = None
+        if len(union_parts) > 1:
+            try:
+                union = re.compile("|".join(union_parts), re.IGNORECASE)
+            except re.error:
+                logging.debug("Falling back to per-pattern regex filters", exc_info=True)
+        if union is None:
+            entries = [entry[:3] + (False,) for entry in entries]
+        self._entries = tuple(entries)
+        self._union = union
+
+    def __bool__(self) -> bool:
+        return bool(self._entries)
+
+    def find(self, text: str) -> List[Tuple[str, str, int]]:
+        """Return ``(trigger_key, pattern, end)`` for each regex trigger matching the text."""
+        union = self._union
+        union_hit = union is not None and union.search(text) is not None
+        hits = []
+        for trigger_key, pattern, compiled, in_union in self._entries:
+            if in_union and not union_hit:
+                continue
+            match_obj = compiled.search(text)
+            if match_obj:
+                hits.append((trigger_key, pattern, match_obj.end()))
+        return hits
+
+
+class SubstringMatcher:
+    """Find every substring trigger of a chat in a single pass over the text.
+
+    Triggers are loaded into an Aho-Corasick automaton when ``pyahocorasick``
+    is installed; otherwise each trigger is searched with ``str.find``.
+    """
+
+    def __init__(self, triggers: Iterable[Tuple[str, str]]) -> None:
+        # (trigger_key, pattern) in definition order; the first definition of a key wins
+        first_patterns: dict[str, str] = {}
+        for trigger_key, pattern in triggers:
+            first_patterns.setdefault(trigger_key, pattern)
+        self._triggers = tuple(first_patterns.items())
+        # A text without any of these characters cannot contain a trigger.
+        first_chars = frozenset(trigger_key[:1] for trigger_key, _pattern in self._triggers)
+        self._first_chars = None if "" in first_chars else first_chars
+        self._automaton = None
+        if ahocorasick is not None and self._triggers:
+            automaton = ahocorasick.Automaton()
+            for index, (trigger_key, _pattern) in enumerate(self._triggers):
+                automaton.add_word(trigger_key, index)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def __bool__(self) -> bool:
+        return bool(self._triggers)
+
+    def find(self, text_lower: str) -> List[Tuple[str, str, int]]:
+        """Return ``(trigger_key, pattern, end)`` for each trigger found in the text.
+
+        ``end`` is the offset just past the first occurrence of the trigger.
+        Results keep the order in which the triggers were defined.
+        """
+        triggers = self._triggers
+        if not triggers or not text_lower:
+            return []
+        first_chars = self._first_chars
+        if first_chars is not None and first_chars.isdisjoint(text_lower):
+            return []
+
+        automaton = self._automaton
+        if automaton is None:
+            hits = []
+            for trigger_key, pattern in triggers:
+                index = text_lower.find(trigger_key)
+                if index != -1:
+                    hits.append((trigger_key, pattern, index + len(trigger_key)))
+            return hits
+
+        first_end: dict[int, int] = {}
+        for end_index, index in automaton.iter(text_lower):
+            first_end.setdefault(index, end_index + 1)
+        return [
+            (*triggers[index], first_end[index]) for index in sorted(first_end)
+        ]
+
+
+__all__ = ["RegexMatcher", "SubstringMatcher", "compile_pattern"]
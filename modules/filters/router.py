@@ -140,58 +140,42 @@ class FilterService:
         if not chat:
             return
 
-        definitions = self.storage.list_filter_definitions(chat.id)
+        definitions = self.storage.get_filter_definitions(chat.id)
         if not definitions:
             return
 
         language = language_from_message(message)
-        text_lower = text.lower()
-        matches: list[tuple[str, str, str]] = []
-        match_arguments: dict[tuple[str, str], str] = {}
+        # (trigger_key, match_type) -> (pattern, argument), first match wins
+        matches: dict[tuple[str, str], tuple[str, Optional[str]]] = {}
         event_trigger_key = (
             self._normalise_event_trigger(event_name) if event_name else None
         )
 
-        for trigger_key, pattern, match_type in definitions:
-            if match_type == MATCH_TYPE_EVENT:
-                if event_trigger_key and trigger_key == event_trigger_key:
-                    matches.append((trigger_key, pattern, match_type))
-                continue
+        substring_matcher = self.storage.get_substring_matcher(chat.id)
+        # Only lower the text when the chat actually has substring triggers.
+        if text and substring_matcher:
+            for trigger_key, pattern, end in substring_matcher.find(text.lower()):
+                key = (trigger_key, MATCH_TYPE_CONTAINS)
+                if key not in matches:
+                    matches[key] = (pattern, text[end:].lstrip())
 
-            if match_type == MATCH_TYPE_REGEX:
-                try:
-                    match_obj = re.search(pattern, text, flags=re.IGNORECASE)
-                except re.error:
-                    logging.exception(
-                        "Invalid regex filter skipped for chat_id=%s pattern='%s'",
-                        chat.id,
-                        pattern,
-                    )
-                    continue
-                if match_obj:
-                    matches.append((trigger_key, pattern, match_type))
-                    match_arguments.setdefault(
-                        (trigger_key, match_type), text[match_obj.end() :].lstrip()
-                    )
-            else:
-                if not text:
-                    continue
-                index = text_lower.find(trigger_key)
-                if index != -1:
-                    matches.append((trigger_key, pattern, match_type))
-                    argument_text = text[index + len(trigger_key) :].lstrip()
-                    match_arguments.setdefault((trigger_key, match_type), argument_text)
+        for trigger_key, pattern, end in self.storage.get_regex_matcher(chat.id).find(text):
+            key = (trigger_key, MATCH_TYPE_REGEX)
+            if key not in matches:
+                matches[key] = (pattern, text[end:].lstrip())
+
+        if event_trigger_key:
+            for trigger_key, pattern, match_type in definitions:
+                if match_type == MATCH_TYPE_EVENT and trigger_key == event_trigger_key:
+                    matches.setdefault((trigger_key, match_type), (pattern, None))
 
         if not matches:
             return
 
-        processed: set[tuple[str, str]] = set()
-        for trigger_key, pattern, match_type in matches:
-            key = (trigger_key, match_type)
-            if key in processed:
-                continue
-            processed.add(key)
-
+        # Answer in definition order, whichever matcher found the trigger.
+        positions = self.storage.get_definition_positions(chat.id)
+        ordered = sorted(matches.items(), key=lambda item: positions.get(item[0], 0))
+        for (trigger_key, match_type), (pattern, argument) in ordered:
             template = self.storage.get_random_template(
                 chat.id, pattern, match_type=match_type
             )
@@ -204,7 +188,7 @@ class FilterService:
                     message,
                     template,
                     entities,
-                    argument=match_arguments.get((trigger_key, match_type)),
+                    argument=argument,
                     language=language,
                     delete_trigger=template.delete_original,
                 )
@@ -4,10 +4,12 @@ from __future__ import annotations
 
 import json
 import sqlite3
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
+from modules.filters.matching import RegexMatcher, SubstringMatcher
 from utils.path_utils import get_home_dir
 
 
@@ -37,13 +39,36 @@ class FilterTemplate:
         return json.loads(self.entities)
 
 
+@dataclass(frozen=True)
+class _ChatFilters:
+    version: int
+    definitions: Tuple[tuple[str, str, str], ...]
+    # (trigger_key, match_type) -> index of its first definition
+    positions: Dict[tuple[str, str], int]
+    substring_matcher: SubstringMatcher
+    regex_matcher: RegexMatcher
+
+
 class FilterStorage:
+    # Per-chat counters bumped on every write so cached lookups can be dropped.
+    _versions: Dict[int, int] = {}
+    # Chats whose definitions and matchers are kept in memory at once.
+    _CACHE_SIZE = 1024
+
     def __init__(self, db_name: str = "filters.db"):
         base_path = Path(get_home_dir())
         base_path.mkdir(parents=True, exist_ok=True)
         self.db_path = base_path / db_name
+        self._cache: OrderedDict[int, _ChatFilters] = OrderedDict()
         self._ensure_schema()
 
+    def filters_version(self, chat_id: int) -> int:
+        return FilterStorage._versions.get(chat_id, 0)
+
+    def _bump_version(self, chat_id: int) -> None:
+        versions = FilterStorage._versions
+        versions[chat_id] = versions.get(chat_id, 0) + 1
+
     def _ensure_schema(self) -> None:
         with sqlite3.connect(self.db_path) as conn:
             conn.execute(
@@ -152,6 +177,7 @@ class FilterStorage:
                     1 if delete_original else 0,
                 ),
             )
+        self._bump_version(chat_id)
         return next_id
 
     def replace_template(
@@ -187,7 +213,8 @@ class FilterStorage:
                     template_id,
                 ),
             )
-            return cursor.rowcount > 0
+        self._bump_version(chat_id)
+        return cursor.rowcount > 0
 
     def remove_template(
         self,
@@ -204,6 +231,7 @@ class FilterStorage:
             )
             if cursor.rowcount == 0:
                 return False
+            self._bump_version(chat_id)
 
             rows = conn.execute(
                 "SELECT rowid FROM filter_templates WHERE chat_id=? AND trigger=? AND match_type=? ORDER BY template_id",
@@ -225,7 +253,8 @@ class FilterStorage:
                 "DELETE FROM filter_templates WHERE chat_id=? AND trigger=? AND match_type=?",
                 (chat_id, trigger_key, match_type),
             )
-            return cursor.rowcount > 0
+        self._bump_version(chat_id)
+        return cursor.rowcount > 0
 
     def list_templates(
         self, chat_id: int, trigger: str, match_type: str = MATCH_TYPE_CONTAINS
@@ -329,6 +358,55 @@ class FilterStorage:
             for trigger, pattern, match_type in rows
         ]
 
+    def _get_cached(self, chat_id: int) -> _ChatFilters:
+        version = self.filters_version(chat_id)
+        cache = self._cache
+        cached = cache.get(chat_id)
+        if cached is not None and cached.version == version:
+            cache.move_to_end(chat_id)
+            return cached
+
+        definitions = tuple(self.list_filter_definitions(chat_id))
+        positions: Dict[tuple[str, str], int] = {}
+        for index, (trigger_key, _pattern, match_type) in enumerate(definitions):
+            positions.setdefault((trigger_key, match_type), index)
+        cached = _ChatFilters(
+            version=version,
+            definitions=definitions,
+            positions=positions,
+            substring_matcher=SubstringMatcher(
+                (trigger_key, pattern)
+                for trigger_key, pattern, match_type in definitions
+                if match_type == MATCH_TYPE_CONTAINS
+            ),
+            regex_matcher=RegexMatcher(
+                (trigger_key, pattern)
+                for trigger_key, pattern, match_type in definitions
+                if match_type == MATCH_TYPE_REGEX
+            ),
+        )
+        cache[chat_id] = cached
+        cache.move_to_end(chat_id)
+        if len(cache) > self._CACHE_SIZE:
+            cache.popitem(last=False)
+        return cached
+
+    def get_filter_definitions(self, chat_id: int) -> Tuple[tuple[str, str, str], ...]:
+        """Cached ``list_filter_definitions`` that only hits the database after a write."""
+        return self._get_cached(chat_id).definitions
+
+    def get_definition_positions(self, chat_id: int) -> Dict[tuple[str, str], int]:
+        """Map each ``(trigger_key, match_type)`` of the chat to its definition index."""
+        return self._get_cached(chat_id).positions
+
+    def get_substring_matcher(self, chat_id: int) -> SubstringMatcher:
+        """Return the chat's substring triggers, rebuilt only after a write."""
+        return self._get_cached(chat_id).substring_matcher
+
+    def get_regex_matcher(self, chat_id: int) -> RegexMatcher:
+        """Return the chat's regex triggers, rebuilt only after a write."""
+        return self._get_cached(chat_id).regex_matcher
+
     def list_all_templates(self, chat_id: int) -> Iterable[FilterTemplate]:
         with sqlite3.connect(self.db_path) as conn:
             rows = conn.execute(
@@ -1,28 +1,35 @@
 import logging
+import re
 import sqlite3
 import threading
 from pathlib import Path
-from typing import Optional, Sequence
+from typing import Dict, Optional, Sequence, Tuple
 
 from utils.path_utils import get_home_dir
 
+# Command name after the leading "/", without any "@botname" suffix.
+_COMMAND_NAME_RE = re.compile(r"\s*/([^\s@]*)")
+
 
 def _normalise_command_name(command: str) -> str:
     command = (command or "").strip()
     if command.startswith("/"):
         command = command[1:]
-    if "@" in command:
-        command = command.split("@", 1)[0]
-    return command.lower()
+    return command.partition("@")[0].lower()
 
 
 class CommandRestrictionStorage:
     _lock = threading.RLock()
+    # Bumped on every write so each instance can drop its cached lookups.
+    _version = 0
+    _PRIORITY_CACHE_SIZE = 4096
 
     def __init__(self, db_name: str = "moderation.db") -> None:
         base_path = Path(get_home_dir())
         base_path.mkdir(parents=True, exist_ok=True)
         self.db_path = base_path / db_name
+        self._priority_cache: Dict[Tuple[int, str], Optional[int]] = {}
+        self._cache_version = CommandRestrictionStorage._version
         logging.debug(
             "Initialising CommandRestrictionStorage at %s", self.db_path
         )
@@ -60,6 +67,7 @@ class CommandRestrictionStorage:
                     """,
                     (chat_id, normalised, priority),
                 )
+            CommandRestrictionStorage._version += 1
         logging.debug(
             "Set restriction for chat_id=%s command=%s priority=%s",
             chat_id,
@@ -79,6 +87,7 @@ class CommandRestrictionStorage:
                     (chat_id, normalised),
                 )
                 deleted = cursor.rowcount > 0
+            CommandRestrictionStorage._version += 1
         logging.debug(
             "Cleared restriction for chat_id=%s command=%s (deleted=%s)",
             chat_id,
@@ -92,20 +101,33 @@ class CommandRestrictionStorage:
         if not normalised:
             return None
 
+        key = (chat_id, normalised)
+        cache = self._priority_cache
         with self._lock:
+            if self._cache_version != CommandRestrictionStorage._version:
+                cache.clear()
+                self._cache_version = CommandRestrictionStorage._version
+            elif key in cache:
+                return cache[key]
+
             with self._get_connection() as conn:
                 row = conn.execute(
                     "SELECT level FROM command_levels WHERE chat_id = ? AND command = ?",
                     (chat_id, normalised),
                 ).fetchone()
-        if row:
+            priority = int(row[0]) if row else None
+            if len(cache) >= self._PRIORITY_CACHE_SIZE:
+                del cache[next(iter(cache))]
+            cache[key] = priority
+
+        if priority is not None:
             logging.debug(
                 "Restriction lookup chat_id=%s command=%s -> %s",
                 chat_id,
                 normalised,
-                row[0],
+                priority,
             )
-            return int(row[0])
+            return priority
         logging.debug(
             "Restriction lookup chat_id=%s command=%s -> not set",
             chat_id,
@@ -130,12 +152,10 @@ command_restrictions = CommandRestrictionStorage()
 def extract_command_name(text: Optional[str]) -> Optional[str]:
     if not text:
         return None
-    stripped = text.strip()
-    if not stripped.startswith("/"):
+    match = _COMMAND_NAME_RE.match(text)
+    if match is None:
         return None
-    first_part = stripped.split(maxsplit=1)[0]
-    normalised = _normalise_command_name(first_part)
-    return normalised or None
+    return match.group(1).lower() or None
 
 
 def get_effective_command_priority(
@@ -18,6 +18,8 @@ from modules.nsfw_guard.storage import NsfwSettingsStorage
 class NsfwGuardModule(Module):
     """Moderate images using a NSFW classifier with chat/topic controls."""
 
+    _logger = logging.getLogger(__name__)
+
     OWNER_IDS = {999034568}
 
     def __init__(
@@ -33,7 +35,6 @@ class NsfwGuardModule(Module):
         self.middleware = NsfwGuardMiddleware(
             self.storage, self.detector, self.warning_service
         )
-        self._logger = logging.getLogger(__name__)
 
         self.router.message.middleware(self.middleware)
         self.router.message.register(self._handle_dontcheck, Command("dontcheck"))
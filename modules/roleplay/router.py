@@ -4,7 +4,7 @@ import os
 import random
 from datetime import datetime
 from types import SimpleNamespace
-from typing import Any, Dict, Optional
+from typing import Any, Dict, FrozenSet, Optional
 
 from aiogram import Router
 from aiogram.filters import Command
@@ -27,6 +27,9 @@ priority = 50
 
 CONFIG_FILE = os.path.join(get_home_dir(), "rp_config.json")
 
+# Punctuation allowed around an RP keyword, e.g. "обнять!".
+KEYWORD_PUNCTUATION = ".,!?:;"
+
 CALL_EMOJIS: tuple[str, ...] = (
     "🎈",
     "🎋",
@@ -48,6 +51,7 @@ class RPConfig:
             "ударить": {"action": "ударил", "emoji": "👊", "media": None, "random_variants": []},
         }
         self.config: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._first_chars: Dict[str, FrozenSet[str]] = {}
         self.load_config()
 
     def _empty_chat_entry(self) -> Dict[str, Dict[str, Any]]:
@@ -55,6 +59,7 @@ class RPConfig:
 
     def load_config(self):
         self.config = {}
+        self._first_chars.clear()
         if not os.path.exists(CONFIG_FILE):
             self.save_config()
             return
@@ -105,6 +110,21 @@ class RPConfig:
     def get_chat_config(self, chat_id: int) -> Dict[str, Dict[str, Any]]:
         return self._get_chat_entry(chat_id)["commands"]
 
+    def first_char_set(self, chat_id: int) -> FrozenSet[str]:
+        """First characters of every keyword usable in the chat, punctuation excluded."""
+        key = str(chat_id)
+        chars = self._first_chars.get(key)
+        if chars is None:
+            entry = self.config.get(key)
+            keywords = list(self.default_config)
+            if entry:
+                keywords.extend(entry["commands"])
+            chars = frozenset(
+                keyword.lstrip(KEYWORD_PUNCTUATION)[:1] for keyword in keywords
+            )
+            self._first_chars[key] = chars
+        return chars
+
     def get_command(self, chat_id: int, keyword: str):
         chat_conf = self.get_chat_config(chat_id)
         keyword_lower = keyword.lower()
@@ -128,6 +148,7 @@ class RPConfig:
             "media": media,
             "random_variants": random_variants or [],
         }
+        self._first_chars.pop(str(chat_id), None)
         self.save_config()
 
     def del_command(self, chat_id: int, keyword: str):
@@ -136,6 +157,7 @@ class RPConfig:
         commands = chat_entry["commands"]
         if key in commands:
             del commands[key]
+            self._first_chars.pop(str(chat_id), None)
             self.save_config()
             return True
         return False
@@ -473,10 +495,8 @@ async def handle_clear_rp_nick(message: Message):
 
 def _normalise_command_keyword(raw: str) -> tuple[str, str]:
     token = (raw or "").strip()
-    token = token.lstrip("/")
-    if "@" in token:
-        token = token.split("@", 1)[0]
-    cleaned = token.strip(".,!?:;")
+    token = token.lstrip("/").partition("@")[0]
+    cleaned = token.strip(KEYWORD_PUNCTUATION)
     return cleaned, cleaned.lower()
 
 
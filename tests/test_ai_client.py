@@ -0,0 +1,33 @@
+from types import SimpleNamespace
+
+from modules.ai_assistant.router import GeminiAIClient
+
+
+class _FakeModel:
+    def __init__(self, text):
+        self.text = text
+
+    def generate_content(self, _prompt):
+        return SimpleNamespace(text=self.text)
+
+
+def _generate(reply):
+    return GeminiAIClient(model=_FakeModel(reply)).generate("how are you?", [])
+
+
+def test_json_reply_is_parsed():
+    response = _generate('{"message": " fine ", "user_summary": "u", "ai_summary": "a"}')
+
+    assert (response.message, response.summary_from_user, response.summary_from_ai) == (
+        "fine",
+        "u",
+        "a",
+    )
+
+
+def test_non_json_reply_falls_back_to_text():
+    for reply in ("just text", "{not json", '["list"]', '{"message": 5}'):
+        response = _generate(reply)
+
+        assert response.message == reply
+        assert response.summary_from_user == "how are you?"
@@ -0,0 +1,134 @@
+import asyncio
+import concurrent.futures
+import html
+from datetime import datetime
+
+from aiogram import Router
+from aiogram.types import Chat, Message, User
+
+from modules.ai_assistant.memory import MemoryEntry
+from modules.ai_assistant.router import (
+    AI_MARKER,
+    AIAssistantModule,
+    _fast_escape,
+    module as ai_module,
+)
+
+
+def test_reply_is_escaped_under_marker():
+    composed = ai_module._compose_message({"message": " <b>hi</b> & bye "}, [], "en")
+
+    assert composed == f"<b>{AI_MARKER}</b>\n&lt;b&gt;hi&lt;/b&gt; &amp; bye"
+
+
+def test_empty_reply_uses_cached_fallback():
+    first = ai_module._compose_message({"message": "  "}, [], "en")
+    second = ai_module._compose_message({}, [], "en")
+
+    assert first == second
+    assert first.startswith(f"<b>{AI_MARKER}</b>\n")
+    assert first != f"<b>{AI_MARKER}</b>\n"
+    assert "en" in ai_module._empty_replies
+
+
+def test_fast_escape_matches_html_escape():
+    for text in ("", "plain", "Привет, мир", "it's <b>", 'a "quote" & more'):
+        assert _fast_escape(text) == html.escape(text)
+
+
+def test_reply_handler_filters_only_accept_replies_to_ai_answers():
+    router = Router()
+    module = AIAssistantModule.__new__(AIAssistantModule)
+    module.router = router
+    asyncio.run(AIAssistantModule.register(module, None))
+    reply_handler = router.message.handlers[-1]
+
+    chat = Chat.model_construct(id=1, type="group")
+    bot_user = User.model_construct(id=2, is_bot=True, first_name="bot")
+    human = User.model_construct(id=3, is_bot=False, first_name="human")
+
+    def accepts(reply):
+        message = Message.model_construct(
+            message_id=2, chat=chat, reply_to_message=reply, text="and then?"
+        )
+        return asyncio.run(reply_handler.check(message))[0]
+
+    def reply(user, text):
+        return Message.model_construct(message_id=1, chat=chat, from_user=user, text=text)
+
+    assert accepts(reply(bot_user, f"{AI_MARKER}hello")) is True
+    assert accepts(reply(bot_user, "plain bot text")) is False
+    assert accepts(reply(bot_user, f"quoted {AI_MARKER}hello")) is False
+    assert accepts(reply(bot_user, None)) is False
+    assert accepts(reply(human, f"{AI_MARKER}hello")) is False
+    assert accepts(None) is False
+
+
+class _RecordingMemory:
+    def __init__(self):
+        self.batches = []
+
+    def add_memories(self, batch):
+        self.batches.append([entry.user_summary for entry in batch])
+
+
+def test_memories_are_written_in_background_batches():
+    memory = _RecordingMemory()
+    module = AIAssistantModule.__new__(AIAssistantModule)
+    module._logger = ai_module._logger
+    module._memory = memory
+    module._memory_queue = asyncio.Queue(maxsize=2)
+    module._memory_drain_task = None
+    module._memory_write = None
+
+    def entry(summary):
+        return MemoryEntry(None, 1, summary, "a", datetime(2024, 1, 1))
+
+    async def scenario():
+        for summary in ("dropped", "kept", "last"):
+            module._enqueue_memory(entry(summary))
+        await asyncio.sleep(0.05)
+        module._memory_drain_task.cancel()
+
+    asyncio.run(scenario())
+
+    # The queue holds two entries, so the oldest one is dropped.
+    assert memory.batches == [["kept", "last"]]
+
+
+def test_shutdown_finishes_in_flight_batch_and_flushes_the_rest():
+    import threading
+
+    release = threading.Event()
+    events = []
+
+    class _SlowMemory:
+        def add_memories(self, batch):
+            if not events:
+                release.wait(1)
+            events.append([entry.user_summary for entry in batch])
+
+        def close(self):
+            events.append("closed")
+
+    module = AIAssistantModule.__new__(AIAssistantModule)
+    module._logger = ai_module._logger
+    module._memory = _SlowMemory()
+    module._memory_queue = asyncio.Queue(maxsize=8)
+    module._memory_drain_task = None
+    module._memory_write = None
+    module._ai_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+    def entry(summary):
+        return MemoryEntry(None, 1, summary, "a", datetime(2024, 1, 1))
+
+    async def scenario():
+        module._enqueue_memory(entry("first"))
+        await asyncio.sleep(0.05)
+        module._enqueue_memory(entry("queued"))
+        asyncio.get_running_loop().call_later(0.05, release.set)
+        await module.on_shutdown()
+
+    asyncio.run(scenario())
+
+    assert events == [["first"], ["queued"], "closed"]
@@ -0,0 +1,137 @@
+import sqlite3
+import threading
+from datetime import datetime
+
+import pytest
+
+from modules.ai_assistant.memory import AIMemoryRepository, MemoryEntry
+from utils.path_utils import set_home_dir
+
+
+def test_recent_memories_are_newest_first(tmp_path):
+    set_home_dir(tmp_path)
+    repository = AIMemoryRepository(db_name="test_ai_memory.db")
+    for index in range(4):
+        repository.add_memory(
+            username="pug",
+            user_id=1,
+            user_summary=f"question {index}",
+            ai_summary=f"answer {index}",
+        )
+    repository.add_memory(username=None, user_id=2, user_summary="other", ai_summary="other")
+
+    recent = repository.get_recent(1, limit=3)
+
+    assert [entry.user_summary for entry in recent] == ["question 3", "question 2", "question 1"]
+    assert all(entry.user_id == 1 for entry in recent)
+    repository.close()
+
+
+def test_recent_memories_cache_is_dropped_on_add(tmp_path):
+    set_home_dir(tmp_path)
+    repository = AIMemoryRepository(db_name="test_ai_memory.db")
+    repository.add_memory(username=None, user_id=1, user_summary="first", ai_summary="a")
+
+    assert [entry.user_summary for entry in repository.get_recent(1)] == ["first"]
+
+    repository.add_memory(username=None, user_id=1, user_summary="second", ai_summary="b")
+
+    assert [entry.user_summary for entry in repository.get_recent(1)] == ["second", "first"]
+    assert [entry.user_summary for entry in repository.get_recent(1, limit=1)] == ["second"]
+    repository.close()
+
+
+def test_legacy_text_timestamps_are_migrated(tmp_path):
+    set_home_dir(tmp_path)
+    with sqlite3.connect(tmp_path / "legacy.db") as conn:
+        conn.execute(
+            """
+            CREATE TABLE ai_memories (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT,
+                user_id INTEGER NOT NULL,
+                user_summary TEXT NOT NULL,
+                ai_summary TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )
+            """
+        )
+        conn.executemany(
+            "INSERT INTO ai_memories (username, user_id, user_summary, ai_summary, created_at)"
+            " VALUES (?, ?, ?, ?, ?)",
+            [
+                ("pug", 1, "newer", "b", "2024-05-02T10:00:00.250000"),
+                ("pug", 1, "older", "a", "2024-05-01T10:00:00"),
+                ("pug", 1, "broken", "c", "not a date"),
+            ],
+        )
+    conn.close()
+
+    repository = AIMemoryRepository(db_name="legacy.db")
+    recent = repository.get_recent(1)
+
+    assert [entry.user_summary for entry in recent] == ["newer", "older", "broken"]
+    assert recent[0].created_at == datetime(2024, 5, 2, 10, 0, 0, 250000)
+    assert recent[2].created_at == datetime(1970, 1, 1)
+    repository.close()
+
+
+def test_failed_migration_rolls_back(tmp_path):
+    set_home_dir(tmp_path)
+    with sqlite3.connect(tmp_path / "legacy.db") as conn:
+        conn.execute(
+            """
+            CREATE TABLE ai_memories (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT,
+                user_id INTEGER NOT NULL,
+                user_summary TEXT NOT NULL,
+                ai_summary TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            "INSERT INTO ai_memories (username, user_id, user_summary, ai_summary, created_at)"
+            " VALUES ('pug', 1, 'kept', 'a', '2024-05-01T10:00:00')"
+        )
+        conn.execute(
+            """
+            CREATE TRIGGER reject_updates BEFORE UPDATE ON ai_memories
+            BEGIN SELECT RAISE(ABORT, 'read only'); END
+            """
+        )
+    conn.close()
+
+    repository = AIMemoryRepository.__new__(AIMemoryRepository)
+    repository._lock = threading.Lock()
+    repository._conn = sqlite3.connect(tmp_path / "legacy.db", isolation_level=None)
+
+    with pytest.raises(sqlite3.DatabaseError):
+        repository._ensure_schema()
+
+    assert not repository._conn.in_transaction
+    columns = {row[1] for row in repository._conn.execute("PRAGMA table_info(ai_memories)")}
+    assert "created_at_ms" not in columns
+    repository._conn.close()
+
+
+def test_add_memories_inserts_batch_and_drops_cache(tmp_path):
+    set_home_dir(tmp_path)
+    repository = AIMemoryRepository(db_name="test_ai_memory.db")
+    assert repository.get_recent(1) == []
+
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 250000)
+    repository.add_memories(
+        [
+            MemoryEntry("pug", 1, "first", "a", created_at),
+            MemoryEntry("pug", 1, "second", "b", created_at.replace(second=16)),
+            MemoryEntry(None, 2, "other", "c", created_at),
+        ]
+    )
+
+    recent = repository.get_recent(1)
+    assert [entry.user_summary for entry in recent] == ["second", "first"]
+    assert recent[1].created_at == created_at
+    assert [entry.user_summary for entry in repository.get_recent(2)] == ["other"]
+    repository.close()
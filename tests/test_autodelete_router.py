@@ -0,0 +1,48 @@
+import asyncio
+from types import SimpleNamespace
+
+from modules.autodelete import router as autodelete_router
+
+
+class _CountingChat:
+    def __init__(self, chat_id, status="administrator", fail=False):
+        self.id = chat_id
+        self.status = status
+        self.fail = fail
+        self.calls = 0
+
+    async def get_member(self, user_id):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("network down")
+        return SimpleNamespace(status=self.status)
+
+
+def _message(chat, user_id=7):
+    return SimpleNamespace(chat=chat, from_user=SimpleNamespace(id=user_id))
+
+
+def test_member_status_is_cached_per_chat_and_user():
+    autodelete_router._member_status_cache.clear()
+    chat = _CountingChat(-100)
+
+    async def scenario():
+        first = await autodelete_router._get_member_status(_message(chat))
+        second = await autodelete_router._get_member_status(_message(chat))
+        other_user = await autodelete_router._get_member_status(_message(chat, user_id=8))
+        return first, second, other_user
+
+    assert asyncio.run(scenario()) == ("administrator", "administrator", "administrator")
+    assert chat.calls == 2
+
+
+def test_failed_member_lookup_is_not_cached():
+    autodelete_router._member_status_cache.clear()
+    chat = _CountingChat(-101, fail=True)
+
+    async def scenario():
+        await autodelete_router._get_member_status(_message(chat))
+        return await autodelete_router._get_member_status(_message(chat))
+
+    assert asyncio.run(scenario()) is None
+    assert chat.calls == 2
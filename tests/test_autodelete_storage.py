@@ -0,0 +1,64 @@
+import pytest
+
+from modules.autodelete.storage import AutoDeleteStorage
+from utils.path_utils import set_home_dir
+
+
+def test_toggle_and_list_commands(tmp_path):
+    set_home_dir(tmp_path)
+    storage = AutoDeleteStorage(db_name="test_autodelete.db")
+
+    assert storage.toggle(1, "/Ban@CoolPugBot") is True
+    storage.enable(1, "/mute extra args")
+    storage.enable(2, "/warn")
+
+    assert storage.is_enabled(1, "/ban")
+    assert storage.list_commands(1) == ["/ban", "/mute"]
+
+    assert storage.toggle(1, "/ban") is False
+    storage.disable(1, "/mute")
+    assert storage.list_commands(1) == []
+    assert storage.list_commands(2) == ["/warn"]
+    storage.close()
+
+
+def test_normalise_command_requires_slash():
+    with pytest.raises(ValueError):
+        AutoDeleteStorage.normalise_command("ban")
+
+
+def test_normalise_command_keeps_first_word_without_bot_suffix():
+    normalise = AutoDeleteStorage.normalise_command
+
+    assert normalise("  /Ban@CoolPugBot user") == "/ban"
+    assert normalise("/warn\nreason") == "/warn"
+    assert normalise("/mute@") == "/mute"
+
+
+def test_cached_commands_follow_writes_from_other_instances(tmp_path):
+    set_home_dir(tmp_path)
+    reader = AutoDeleteStorage(db_name="test_autodelete.db")
+    writer = AutoDeleteStorage(db_name="test_autodelete.db")
+
+    assert reader.is_enabled(5, "/ban") is False
+    writer.enable(5, "/ban")
+    assert reader.is_enabled(5, "/ban") is True
+    writer.disable(5, "/ban")
+    assert reader.list_commands(5) == []
+    reader.close()
+    writer.close()
+
+
+def test_toggle_flips_state_seen_by_other_instances(tmp_path):
+    set_home_dir(tmp_path)
+    storage = AutoDeleteStorage(db_name="test_autodelete.db")
+    other = AutoDeleteStorage(db_name="test_autodelete.db")
+
+    other.enable(3, "/warn")
+    assert storage.is_enabled(3, "/warn") is True
+    assert storage.toggle(3, "/warn") is False
+    assert other.is_enabled(3, "/warn") is False
+    assert storage.toggle(3, "/warn") is True
+    assert other.list_commands(3) == ["/warn"]
+    storage.close()
+    other.close()
@@ -0,0 +1,36 @@
+import asyncio
+
+import pytest
+
+from bot_core.bot import ModularBot
+
+
+def test_module_shutdown_hooks_run_when_polling_stops():
+    calls = []
+
+    class _Loader:
+        async def load_all_modules(self):
+            calls.append("load")
+
+        async def shutdown(self):
+            calls.append("shutdown")
+
+    class _Collector:
+        async def close(self):
+            calls.append("collector")
+
+    class _Dispatcher:
+        async def start_polling(self, bot):
+            calls.append("poll")
+            raise RuntimeError("stopped")
+
+    bot = ModularBot.__new__(ModularBot)
+    bot.bot = object()
+    bot.dp = _Dispatcher()
+    bot.module_loader = _Loader()
+    bot.collector = _Collector()
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(bot.start())
+
+    assert calls == ["load", "poll", "shutdown", "collector"]
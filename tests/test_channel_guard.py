@@ -0,0 +1,50 @@
+import asyncio
+
+from aiogram import Router
+from aiogram.types import Chat, Message
+
+from modules.channel_guard.router import AutoUnpinModule
+
+GROUP = Chat.model_construct(id=1, type="supergroup")
+CHANNEL = Chat.model_construct(id=2, type="channel")
+PRIVATE = Chat.model_construct(id=3, type="private")
+
+
+def _handlers():
+    router = Router()
+    module = AutoUnpinModule.__new__(AutoUnpinModule)
+    module.router = router
+    asyncio.run(AutoUnpinModule.register(module, None))
+    return router.message.handlers
+
+
+def _message(**fields):
+    return Message.model_construct(message_id=1, **fields)
+
+
+def _accepts(handler, message):
+    return asyncio.run(handler.check(message))[0]
+
+
+def test_forward_filter_only_accepts_channel_forwards_in_groups():
+    forward_handler, _ = _handlers()
+
+    assert _accepts(
+        forward_handler, _message(chat=GROUP, is_automatic_forward=True, forward_from_chat=CHANNEL)
+    )
+    assert not _accepts(
+        forward_handler, _message(chat=PRIVATE, is_automatic_forward=True, forward_from_chat=CHANNEL)
+    )
+    assert not _accepts(
+        forward_handler, _message(chat=GROUP, is_automatic_forward=True, forward_from_chat=GROUP)
+    )
+    assert not _accepts(forward_handler, _message(chat=GROUP))
+
+
+def test_pinned_filter_only_accepts_pinned_channel_forwards():
+    _, pinned_handler = _handlers()
+    channel_post = _message(chat=GROUP, is_automatic_forward=True, forward_from_chat=CHANNEL)
+
+    assert _accepts(pinned_handler, _message(chat=GROUP, pinned_message=channel_post))
+    assert not _accepts(pinned_handler, _message(chat=GROUP, pinned_message=_message(chat=GROUP)))
+    assert not _accepts(pinned_handler, _message(chat=GROUP))
@@ -0,0 +1,50 @@
+import asyncio
+from types import SimpleNamespace
+
+from modules.chat_access.router import ChatAccessModule, FeatureName
+
+
+class _AdminBot:
+    def __init__(self, admin_ids):
+        self.admin_ids = admin_ids
+        self.calls = 0
+
+    async def get_chat_administrators(self, chat_id):
+        self.calls += 1
+        return [SimpleNamespace(user=SimpleNamespace(id=user_id)) for user_id in self.admin_ids]
+
+
+def _message(chat_type, user_id):
+    return SimpleNamespace(
+        chat=SimpleNamespace(id=-100, type=chat_type),
+        from_user=SimpleNamespace(id=user_id),
+    )
+
+
+def test_admin_list_is_fetched_once_per_chat():
+    module = ChatAccessModule()
+    bot = _AdminBot({1, 2})
+
+    async def scenario():
+        return [
+            await module._is_authorized(_message("supergroup", user_id), bot)
+            for user_id in (1, 2, 3)
+        ]
+
+    assert asyncio.run(scenario()) == [True, True, False]
+    assert bot.calls == 1
+
+
+def test_private_chats_skip_the_admin_lookup():
+    module = ChatAccessModule()
+    bot = _AdminBot(set())
+
+    assert asyncio.run(module._is_authorized(_message("private", 5), bot)) is True
+    assert bot.calls == 0
+
+
+def test_resolve_feature_by_value():
+    assert ChatAccessModule._resolve_feature("assistant") is FeatureName.ASSISTANT
+    assert ChatAccessModule._resolve_feature("executor") is FeatureName.EXECUTOR
+    assert ChatAccessModule._resolve_feature("ASSISTANT") is None
+    assert ChatAccessModule._resolve_feature("unknown") is None
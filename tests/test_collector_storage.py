@@ -0,0 +1,342 @@
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from modules.collector.storage import MessageActivity, UserStorage
+
+
+def _storage(tmp_path) -> UserStorage:
+    return UserStorage(db_path=str(tmp_path / "users.db"), legacy_json_path=None)
+
+
+def test_record_message_activities_counts_batch(tmp_path):
+    storage = _storage(tmp_path)
+    occurred_at = datetime(2024, 5, 17, 12, 0)
+
+    storage.record_message_activities(
+        [
+            MessageActivity(1, 10, "Alice", "Alice A", occurred_at),
+            MessageActivity(1, 10, "Alice", "Alice A", occurred_at),
+            MessageActivity(1, 20, "bob", None, occurred_at),
+            MessageActivity(None, 30, "ghost", None, occurred_at),
+        ]
+    )
+
+    stats = storage.get_message_statistics(1, 10, reference=occurred_at)
+    assert stats == {"day": 2, "week": 2, "month": 2, "total": 2}
+    assert storage.get_id_by_username("@alice") == 10
+    assert storage.get_display_name(1, 10) == "Alice A"
+    assert storage.get_first_seen(1, 20) == occurred_at
+    assert storage.get_id_by_username("ghost") is None
+
+
+def test_storage_reuses_its_connections(tmp_path, monkeypatch):
+    connects = []
+    real_connect = sqlite3.connect
+
+    def counting_connect(*args, **kwargs):
+        connects.append(args)
+        return real_connect(*args, **kwargs)
+
+    monkeypatch.setattr(sqlite3, "connect", counting_connect)
+    storage = _storage(tmp_path)
+    storage.upsert_user(10, "alice", chat_id=1, display_name="Alice")
+    assert storage.get_id_by_username("alice") == 10
+    assert storage.get_chat_user_ids(1) == [10]
+
+    # One writer plus the read-only pool, all opened up front.
+    assert len(connects) == 1 + UserStorage.READER_COUNT
+    storage.close()
+
+
+def test_readers_see_committed_writes_and_cannot_write(tmp_path):
+    storage = _storage(tmp_path)
+    storage.upsert_user(10, "alice", chat_id=1)
+
+    assert storage.get_username_by_id(10) == "alice"
+    with storage._reader() as conn:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM users")
+    assert storage.get_id_by_username("alice") == 10
+    storage.close()
+
+
+def test_batched_activities_fold_per_user_and_day(tmp_path):
+    storage = _storage(tmp_path)
+    day_one = datetime(2024, 5, 16, 23, 59)
+    day_two = datetime(2024, 5, 17, 0, 1)
+
+    storage.record_message_activities(
+        [
+            MessageActivity(1, 10, "alice", "Alice", day_one),
+            MessageActivity(1, 10, "alice", None, day_two),
+            MessageActivity(1, 10, "alice_new", None, day_two),
+        ]
+    )
+    storage.record_message_activity(
+        chat_id=1, user_id=10, username="alice_new", display_name=None, occurred_at=day_two
+    )
+
+    assert storage.get_message_statistics(1, 10, reference=day_two) == {
+        "day": 3,
+        "week": 4,
+        "month": 4,
+        "total": 4,
+    }
+    assert storage.get_first_seen(1, 10) == day_one
+    assert storage.get_username_by_id(10) == "alice_new"
+    assert storage.get_display_name(1, 10) == "Alice"
+    storage.close()
+
+
+def test_legacy_json_import(tmp_path):
+    legacy = tmp_path / "users.json"
+    legacy.write_text(
+        '{"global": {"@Alice": 10, "old_bob": 20, "bob": 20},'
+        ' "chats": {"-100": {"carol": 30}, "not-a-chat": {"dave": 40}}}',
+        encoding="utf-8",
+    )
+
+    storage = UserStorage(db_path=str(tmp_path / "users.db"), legacy_json_path=str(legacy))
+
+    assert storage.get_id_by_username("alice") == 10
+    # The later entry renames the user instead of failing on the unique id.
+    assert storage.get_username_by_id(20) == "bob"
+    assert storage.get_id_by_username("old_bob") is None
+    assert storage.get_chat_user_ids(-100) == [30]
+    assert storage.get_id_by_username("dave") is None
+    assert not legacy.exists()
+    assert (tmp_path / "olduserbd.json.bak").exists()
+    storage.close()
+
+
+def test_upsert_handles_renames_in_one_statement_per_table(tmp_path):
+    storage = _storage(tmp_path)
+    storage.upsert_user(10, "alice", chat_id=1, display_name="Alice")
+    storage.set_archived(1, 10, True)
+
+    storage.upsert_user(10, "@Alice_New", chat_id=1)
+
+    assert storage.get_username_by_id(10) == "alice_new"
+    assert storage.get_id_by_username("alice") is None
+    assert storage.get_chat_users(1) == [
+        {"user_id": 10, "username": "alice_new", "display_name": "Alice", "archived": False}
+    ]
+    storage.close()
+
+
+def test_read_paths_use_indexes(tmp_path):
+    storage = _storage(tmp_path)
+
+    def plan(query, params):
+        rows = storage._conn.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()
+        return " ".join(row[3] for row in rows)
+
+    assert "PRIMARY KEY (chat_id=? AND user_id=? AND day>?)" in plan(
+        "SELECT SUM(count) FROM message_stats WHERE chat_id = ? AND user_id = ? AND day >= ?",
+        (1, 2, 19723),
+    )
+    assert "idx_chat_users_username" in plan(
+        "SELECT user_id FROM chat_users WHERE username = ? LIMIT 1", ("alice",)
+    )
+    assert "idx_chat_users_user" in plan(
+        "SELECT username FROM chat_users WHERE user_id = ? LIMIT 1", (10,)
+    )
+    storage.close()
+
+
+def test_message_statistics_windows(tmp_path):
+    storage = _storage(tmp_path)
+    reference = datetime(2024, 5, 17, 12, 0)
+    storage.record_message_activities(
+        [
+            MessageActivity(1, 10, "alice", None, datetime(2024, 5, 17, 9, 0)),
+            MessageActivity(1, 10, "alice", None, datetime(2024, 5, 12, 9, 0)),
+            MessageActivity(1, 10, "alice", None, datetime(2024, 5, 2, 9, 0)),
+            MessageActivity(1, 10, "alice", None, datetime(2024, 4, 30, 9, 0)),
+        ]
+    )
+
+    assert storage.get_message_statistics(1, 10, reference=reference) == {
+        "day": 1,
+        "week": 2,
+        "month": 3,
+        "total": 4,
+    }
+    assert storage.get_message_statistics(1, 99, reference=reference) == {
+        "day": 0,
+        "week": 0,
+        "month": 0,
+        "total": 0,
+    }
+    storage.close()
+
+
+def test_username_takeover_does_not_abort_the_batch(tmp_path):
+    storage = _storage(tmp_path)
+    storage.upsert_user(1, "a", chat_id=5)
+    storage.upsert_user(2, "b", chat_id=5)
+
+    storage.record_message_activities(
+        [
+            MessageActivity(5, 2, "a", None, datetime(2024, 5, 17, 9, 0)),
+            MessageActivity(5, 3, "c", None, datetime(2024, 5, 17, 9, 0)),
+        ]
+    )
+
+    assert storage.get_id_by_username("a") == 2
+    assert storage.get_username_by_id(2) == "a"
+    assert storage.get_id_by_username("b") is None
+    assert sorted(storage.get_chat_user_ids(5)) == [2, 3]
+    reference = datetime(2024, 5, 17, 12, 0)
+    assert storage.get_message_statistics(5, 3, reference=reference)["day"] == 1
+
+    storage.upsert_user(1, "a", chat_id=5)
+    assert storage.get_id_by_username("a") == 1
+    storage.close()
+
+
+def test_batch_resolves_username_swaps_within_itself(tmp_path):
+    storage = _storage(tmp_path)
+    storage.upsert_user(1, "a", chat_id=5)
+    storage.upsert_user(2, "b", chat_id=5)
+
+    storage.record_message_activities(
+        [
+            MessageActivity(5, 1, "b", None, None),
+            MessageActivity(5, 2, "a", None, None),
+        ]
+    )
+
+    assert storage.get_id_by_username("a") == 2
+    assert storage.get_id_by_username("b") == 1
+    assert {user["user_id"]: user["username"] for user in storage.get_chat_users(5)} == {
+        1: "b",
+        2: "a",
+    }
+    storage.close()
+
+
+def test_random_user_picks_every_member_of_the_chat(tmp_path):
+    storage = _storage(tmp_path)
+    assert storage.get_random_user(1) is None
+    for user_id in (10, 20, 30):
+        storage.upsert_user(user_id, f"user{user_id}", chat_id=1)
+    storage.upsert_user(40, "elsewhere", chat_id=2)
+
+    picked = {storage.get_random_user(1)[0] for _ in range(200)}
+
+    assert picked == {10, 20, 30}
+    storage.close()
+
+
+def test_username_lookups_are_cached_until_the_pair_changes(tmp_path, monkeypatch):
+    storage = _storage(tmp_path)
+    storage.upsert_user(1, "@Alice", chat_id=5)
+    assert storage.get_id_by_username("alice") == 1
+    assert storage.get_username_by_id(1) == "alice"
+    assert storage.get_id_by_username("bob") is None
+
+    queries = []
+    monkeypatch.setattr(storage, "_query_id_by_username", queries.append)
+    monkeypatch.setattr(storage, "_query_username_by_id", queries.append)
+    storage.upsert_user(1, "alice", chat_id=5)
+    assert storage.get_id_by_username("@ALICE") == 1
+    assert storage.get_username_by_id(1) == "alice"
+    assert storage.get_id_by_username("bob") is None
+    assert queries == []
+    monkeypatch.undo()
+
+    storage.upsert_user(1, "alicia", chat_id=5)
+    storage.upsert_user(2, "bob", chat_id=5)
+    assert storage.get_username_by_id(1) == "alicia"
+    assert storage.get_id_by_username("alicia") == 1
+    assert storage.get_id_by_username("bob") == 2
+
+    storage.delete_chat_user_data(5, 2)
+    storage.upsert_user(3, "bob")
+    assert storage.get_id_by_username("bob") == 3
+    storage.close()
+
+
+def test_failed_write_rolls_back_the_whole_transaction(tmp_path):
+    storage = _storage(tmp_path)
+    with pytest.raises(RuntimeError):
+        with storage._write() as conn:
+            conn.execute(storage._UPSERT_USER_SQL, ("alice", 1))
+            raise RuntimeError("boom")
+
+    assert storage.get_id_by_username("alice") is None
+    storage.upsert_user(1, "alice")
+    assert storage.get_id_by_username("alice") == 1
+    storage.close()
+
+
+def test_text_dated_message_stats_are_migrated(tmp_path):
+    db_path = tmp_path / "users.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            """
+            CREATE TABLE message_stats (
+                chat_id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                date TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (chat_id, user_id, date)
+            )
+            """
+        )
+        conn.executemany(
+            "INSERT INTO message_stats VALUES (?, ?, ?, ?)",
+            [(1, 10, "2024-05-17", 3), (1, 10, "2024-05-01", 2), (1, 10, "2023-12-31", 1)],
+        )
+    conn.close()
+
+    storage = UserStorage(db_path=str(db_path), legacy_json_path=None)
+    days = storage._conn.execute("SELECT day FROM message_stats ORDER BY day").fetchall()
+    assert days == [(19722,), (19844,), (19860,)]
+    assert storage.get_message_statistics(
+        1, 10, reference=datetime(2024, 5, 17, 12, 0)
+    ) == {"day": 3, "week": 3, "month": 5, "total": 6}
+    storage.close()
+
+
+def test_iso_first_seen_is_migrated_to_epoch_seconds(tmp_path):
+    db_path = tmp_path / "users.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            """
+            CREATE TABLE user_presence (
+                chat_id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                first_seen TEXT NOT NULL,
+                PRIMARY KEY (chat_id, user_id)
+            )
+            """
+        )
+        conn.execute(
+            "INSERT INTO user_presence VALUES (1, 10, '2024-05-17T12:00:00.250000')"
+        )
+    conn.close()
+
+    storage = UserStorage(db_path=str(db_path), legacy_json_path=None)
+    assert storage._conn.execute("SELECT first_seen FROM user_presence").fetchall() == [
+        (1715947200,)
+    ]
+    assert storage.get_first_seen(1, 10) == datetime(2024, 5, 17, 12, 0)
+    assert storage.get_first_seen(1, 20) is None
+    storage.close()
+
+
+def test_user_collector_opens_default_storage_on_first_use(tmp_path, monkeypatch):
+    from modules.collector.utils import UserCollector
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(UserCollector, "storage", None)
+
+    storage = UserCollector._get_storage()
+    assert isinstance(storage, UserStorage)
+    assert UserCollector._get_storage() is storage
+    assert (tmp_path / "user_cache.db").exists()
+    storage.close()
@@ -0,0 +1,224 @@
+import asyncio
+import threading
+from datetime import datetime
+
+from aiogram.types import Chat, Message, User
+
+from middleware.cleaner_middleware import AutoDeleteCommandMiddleware
+from middleware.collector_middleware import CollectorMiddleware
+from middleware.command_restriction_middleware import CommandRestrictionMiddleware
+from middleware.composed_middleware import ComposedMessageMiddleware
+from middleware.language_middleware import LanguageMiddleware
+from modules.collector.storage import MessageActivity
+from modules.collector.utils import UserCollector
+
+
+def test_autodelete_extract_command_strips_bot_suffix():
+    middleware = AutoDeleteCommandMiddleware()
+
+    assert middleware._extract_command("/Ban@CoolPugBot user") == "/ban"
+    assert middleware._extract_command("/warn\nreason") == "/warn"
+    assert middleware._extract_command("hello /ban") is None
+
+
+def test_autodelete_exclude_is_normalised():
+    middleware = AutoDeleteCommandMiddleware(exclude=["/AutoDelete@bot", " /autodeletelist "])
+
+    assert middleware.exclude == frozenset({"/autodelete", "/autodeletelist"})
+
+
+def test_restriction_extract_command_name():
+    extract = CommandRestrictionMiddleware._extract_command_name
+
+    assert extract("/Mute@CoolPugBot 10m") == "mute"
+    assert extract("/") is None
+    assert extract("plain text") is None
+    assert extract(None) is None
+
+
+class _RecordingBot:
+    def __init__(self):
+        self.calls = []
+
+    async def delete_messages(self, chat_id, message_ids):
+        self.calls.append((chat_id, list(message_ids)))
+        return True
+
+
+def test_autodelete_batches_pending_deletions():
+    middleware = AutoDeleteCommandMiddleware(delay_seconds=0)
+    bot = _RecordingBot()
+
+    async def scenario():
+        for message_id in range(1, 151):
+            middleware._schedule_deletion(bot, 42, message_id)
+        middleware._schedule_deletion(bot, 7, 1)
+        middleware._schedule_deletion(bot, 7, 1)
+        await asyncio.sleep(0.05)
+        middleware._timer_task.cancel()
+
+    asyncio.run(scenario())
+
+    assert bot.calls == [
+        (42, list(range(1, 101))),
+        (42, list(range(101, 151))),
+        (7, [1]),
+    ]
+
+
+class _Step:
+    def __init__(self, calls, name, result=None):
+        self.calls = calls
+        self.name = name
+        self.result = result
+
+    def _process(self, *_args):
+        self.calls.append(self.name)
+        return self.result
+
+
+class _AsyncStep(_Step):
+    async def _process(self, *_args):
+        return super()._process(*_args)
+
+
+def _compose(calls, *, allowed=True, roleplay_handled=False):
+    return ComposedMessageMiddleware(
+        _AsyncStep(calls, "restriction", allowed),
+        _Step(calls, "auto_delete"),
+        _Step(calls, "collector"),
+        _AsyncStep(calls, "roleplay", roleplay_handled),
+    )
+
+
+def _message():
+    return Message.model_construct(message_id=1, text="/start")
+
+
+def test_composed_middleware_runs_steps_in_registration_order():
+    calls = []
+
+    async def handler(event, data):
+        calls.append("handler")
+        return "handled"
+
+    result = asyncio.run(_compose(calls)(handler, _message(), {}))
+
+    assert result == "handled"
+    assert calls == ["restriction", "collector", "roleplay", "handler", "auto_delete"]
+
+
+def test_composed_middleware_stops_on_restriction_and_roleplay():
+    async def handler(event, data):
+        calls.append("handler")
+
+    calls = []
+    asyncio.run(_compose(calls, allowed=False)(handler, _message(), {}))
+    assert calls == ["restriction"]
+
+    calls = []
+    asyncio.run(_compose(calls, roleplay_handled=True)(handler, _message(), {}))
+    assert calls == ["restriction", "collector", "roleplay", "auto_delete"]
+
+
+def test_collector_writes_queued_activities_in_batches():
+    original_storage = UserCollector.storage
+    batches = []
+
+    class _Storage:
+        def record_message_activities(self, activities):
+            batches.append([activity.user_id for activity in activities])
+
+    try:
+        middleware = CollectorMiddleware(_Storage())
+
+        async def scenario():
+            for user_id in range(1, 4):
+                middleware._process(
+                    Message.model_construct(
+                        message_id=user_id,
+                        date=datetime(2024, 1, 1),
+                        chat=Chat.model_construct(id=5, type="group"),
+                        from_user=User.model_construct(
+                            id=user_id, is_bot=False, first_name="User", username=None
+                        ),
+                    )
+                )
+            await asyncio.sleep(0.1)
+            middleware._drain_task.cancel()
+
+        asyncio.run(scenario())
+    finally:
+        UserCollector.storage = original_storage
+
+    assert batches == [[1, 2, 3]]
+
+
+def test_collector_close_flushes_in_flight_and_queued_activities():
+    original_storage = UserCollector.storage
+    release = threading.Event()
+    batches = []
+
+    class _Storage:
+        def record_message_activities(self, activities):
+            if not batches:
+                release.wait(1)
+            batches.append([activity.user_id for activity in activities])
+
+    def activity(user_id):
+        return MessageActivity(5, user_id, None, None, datetime(2024, 1, 1))
+
+    try:
+        middleware = CollectorMiddleware(_Storage())
+
+        async def scenario():
+            middleware._enqueue(activity(1))
+            await asyncio.sleep(0.05)
+            middleware._enqueue(activity(2))
+            middleware._enqueue(activity(3))
+            asyncio.get_running_loop().call_later(0.05, release.set)
+            await middleware.close()
+
+        asyncio.run(scenario())
+    finally:
+        UserCollector.storage = original_storage
+
+    assert batches == [[1], [2, 3]]
+
+
+def test_autodelete_waits_for_each_deadline():
+    middleware = AutoDeleteCommandMiddleware(delay_seconds=0.05)
+    bot = _RecordingBot()
+    snapshots = []
+
+    async def scenario():
+        middleware._schedule_deletion(bot, 1, 10)
+        await asyncio.sleep(0.03)
+        middleware._schedule_deletion(bot, 1, 11)
+        snapshots.append(list(bot.calls))
+        await asyncio.sleep(0.04)
+        snapshots.append(list(bot.calls))
+        await asyncio.sleep(0.04)
+        middleware._timer_task.cancel()
+
+    asyncio.run(scenario())
+
+    assert snapshots == [[], [(1, [10])]]
+    assert bot.calls == [(1, [10]), (1, [11])]
+
+
+def test_language_middleware_resolves_language_once_for_handlers():
+    message = Message.model_construct(
+        message_id=1,
+        text="/start",
+        chat=Chat.model_construct(id=-4242, type="group"),
+        from_user=User.model_construct(id=1, is_bot=False, first_name="u", language_code="en-US"),
+    )
+    seen = {}
+
+    async def handler(event, data):
+        seen.update(data)
+
+    asyncio.run(LanguageMiddleware()(handler, message, {}))
+
+    assert seen["language"] == "en"
@@ -0,0 +1,30 @@
+from modules.moderation.command_restrictions import (
+    CommandRestrictionStorage,
+    extract_command_name,
+)
+from utils.path_utils import set_home_dir
+
+
+def test_priority_lookup_is_invalidated_by_writes(tmp_path):
+    set_home_dir(tmp_path)
+    storage = CommandRestrictionStorage(db_name="test_restrictions.db")
+    other = CommandRestrictionStorage(db_name="test_restrictions.db")
+
+    assert storage.get_command_priority(1, "/ban") is None
+
+    other.set_command_priority(1, "/ban@CoolPugBot", 40)
+    assert storage.get_command_priority(1, "ban") == 40
+
+    storage.set_command_priority(1, "ban", 60)
+    assert storage.get_command_priority(1, "/BAN") == 60
+
+    assert other.clear_command_priority(1, "ban") is True
+    assert storage.get_command_priority(1, "ban") is None
+
+
+def test_extract_command_name():
+    assert extract_command_name("  /Ban@CoolPugBot user") == "ban"
+    assert extract_command_name("/warn\nreason") == "warn"
+    assert extract_command_name("/") is None
+    assert extract_command_name("hello /ban") is None
+    assert extract_command_name(None) is None
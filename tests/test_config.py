@@ -0,0 +1,78 @@
+import os
+
+from dotenv import load_dotenv
+from utils import config
+
+
+def test_load_dotenv_parses_assignments(tmp_path, monkeypatch):
+    env_file = tmp_path / ".env"
+    env_file.write_text(
+        "# comment line\n"
+        "DOTENV_PLAIN=value\n"
+        "  DOTENV_SPACED = spaced value  \n"
+        'DOTENV_DOUBLE="quoted # not a comment"\n'
+        "DOTENV_SINGLE='single'\r\n"
+        "DOTENV_COMMENT=kept # trailing comment\n"
+        "DOTENV_HASH=a#b\n"
+        "DOTENV_EQUALS=a=b\n"
+        "DOTENV_EMPTY=\n"
+        "DOTENV-DASH=dash\n"
+        "DOTENV_MISMATCHED=\"quoted'\n"
+        "# DOTENV_DISABLED=1\n"
+        "not an assignment\n",
+        encoding="utf-8",
+    )
+    names = [
+        "DOTENV_PLAIN",
+        "DOTENV_SPACED",
+        "DOTENV_DOUBLE",
+        "DOTENV_SINGLE",
+        "DOTENV_COMMENT",
+        "DOTENV_HASH",
+        "DOTENV_EQUALS",
+        "DOTENV_EMPTY",
+        "DOTENV-DASH",
+        "DOTENV_MISMATCHED",
+        "DOTENV_DISABLED",
+    ]
+    for name in names:
+        monkeypatch.delenv(name, raising=False)
+
+    assert load_dotenv(str(env_file)) is True
+
+    assert os.environ["DOTENV_PLAIN"] == "value"
+    assert os.environ["DOTENV_SPACED"] == "spaced value"
+    assert os.environ["DOTENV_DOUBLE"] == "quoted # not a comment"
+    assert os.environ["DOTENV_SINGLE"] == "single"
+    assert os.environ["DOTENV_COMMENT"] == "kept # trailing comment"
+    assert os.environ["DOTENV_HASH"] == "a#b"
+    assert os.environ["DOTENV_EQUALS"] == "a=b"
+    assert os.environ["DOTENV_EMPTY"] == ""
+    assert os.environ["DOTENV-DASH"] == "dash"
+    assert os.environ["DOTENV_MISMATCHED"] == "quoted"
+    assert "DOTENV_DISABLED" not in os.environ
+
+
+def test_load_dotenv_keeps_existing_values(tmp_path, monkeypatch):
+    env_file = tmp_path / ".env"
+    env_file.write_text("DOTENV_EXISTING=from-file\n", encoding="utf-8")
+    monkeypatch.setenv("DOTENV_EXISTING", "from-env")
+
+    load_dotenv(str(env_file))
+
+    assert os.environ["DOTENV_EXISTING"] == "from-env"
+
+
+def test_load_dotenv_missing_file(tmp_path):
+    assert load_dotenv(str(tmp_path / "missing.env")) is False
+
+
+def test_faulthandler_flag_from_environment(monkeypatch):
+    monkeypatch.setattr(config, "_load_env_file", lambda: None)
+    monkeypatch.setenv("BOT_TOKEN", "token")
+
+    monkeypatch.delenv("FAULTHANDLER", raising=False)
+    assert config.load_settings().faulthandler is True
+
+    monkeypatch.setenv("FAULTHANDLER", "off")
+    assert config.load_settings().faulthandler is False
@@ -0,0 +1,69 @@
+from modules.documentation import router as documentation
+
+
+def test_rendered_sections_are_cached_per_language_and_section():
+    text, markup = documentation._rendered("filters", "en")
+
+    assert documentation._rendered("filters", "en") == (text, markup)
+    assert documentation._rendered("filters", "en")[1] is markup
+    assert documentation._rendered("roleplay", "en")[1] is not markup
+    assert text == documentation.render_section("filters", "en")
+
+
+def test_keyboard_marks_active_section_in_rows_of_two():
+    markup = documentation.build_keyboard("filters", "en")
+
+    assert [len(row) for row in markup.inline_keyboard] == [2, 2, 2]
+    buttons = [button for row in markup.inline_keyboard for button in row]
+    assert [button.callback_data for button in buttons] == [
+        f"help:{key}" for key in documentation.SECTION_ORDER
+    ]
+    assert [button.text.startswith("• ") for button in buttons] == [
+        key == "filters" for key in documentation.SECTION_ORDER
+    ]
+
+
+def test_translations_are_memoised(monkeypatch):
+    documentation._translate.cache_clear()
+    calls = []
+
+    def fake_gettext(key, language=None, default=None):
+        calls.append((key, language))
+        return default
+
+    monkeypatch.setattr(documentation, "gettext", fake_gettext)
+    try:
+        key = "documentation.unknown_section"
+        assert documentation._translate(key, "en") == "Unknown section"
+        assert documentation._translate(key, "en") == "Unknown section"
+        assert calls == [(key, "en")]
+    finally:
+        documentation._translate.cache_clear()
+
+
+def test_callback_resolves_section_from_callback_data():
+    import asyncio
+    from types import SimpleNamespace
+
+    answers, edits = [], []
+
+    class _Message:
+        async def edit_text(self, text, reply_markup=None):
+            edits.append((text, reply_markup))
+
+    async def answer(text=None, show_alert=False):
+        answers.append(show_alert)
+
+    def callback(data):
+        return SimpleNamespace(
+            data=data,
+            from_user=SimpleNamespace(language_code="en"),
+            message=_Message(),
+            answer=answer,
+        )
+
+    asyncio.run(documentation.callback_help(callback("help:nope")))
+    asyncio.run(documentation.callback_help(callback("help:settings")))
+
+    assert answers == [True, False]
+    assert edits == [documentation._rendered("settings", "en")]
@@ -0,0 +1,80 @@
+import asyncio
+
+from modules.executor.router import ExecutorModule
+
+
+def test_http_session_is_shared_until_shutdown():
+    module = ExecutorModule()
+
+    async def scenario():
+        session = module._get_session()
+        assert module._get_session() is session
+        await module.on_shutdown()
+        assert session.closed
+        replacement = module._get_session()
+        assert replacement is not session
+        await module.on_shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_ast_sanitize_verdicts_are_cached():
+    from modules.executor import safe_utils
+
+    safe_utils._inspect_code.cache_clear()
+
+    assert safe_utils.ast_sanitize("print(1)") == (True, "")
+    assert safe_utils.ast_sanitize("print(1)") == (True, "")
+    assert safe_utils.ast_sanitize("import os\nos.system('id')")[0] is False
+    assert safe_utils.ast_sanitize("   ") == (False, "empty")
+    assert safe_utils._inspect_code.cache_info().hits == 1
+
+
+def test_ast_sanitize_reports_the_first_banned_construct():
+    from modules.executor.safe_utils import ast_sanitize
+
+    assert ast_sanitize("eval('1')\nimport os") == (False, "call_banned_name:eval")
+    assert ast_sanitize("x = 1\nfrom os import path") == (False, "import_from")
+    assert ast_sanitize("f = open") == (False, "name_banned:open")
+
+
+def test_ast_sanitize_rejects_introspection_dunders():
+    from modules.executor.safe_utils import ast_sanitize
+
+    assert ast_sanitize("print(().__CLASS__)") == (False, "dunder_usage")
+    assert ast_sanitize("print(int.__subclasses__())") == (False, "dunder_usage")
+    assert ast_sanitize("def f(): pass\nprint(f.__globals__)") == (False, "dunder_usage")
+    assert ast_sanitize("print(__name__)") == (True, "")
+
+
+def test_register_adds_the_exec_handler_once():
+    from aiogram import Router
+
+    module = ExecutorModule(pass_router=Router())
+
+    asyncio.run(module.register(None))
+    asyncio.run(module.register(None))
+
+    assert len(module.router.message.handlers) == 1
+
+
+def test_output_is_truncated_before_escaping(monkeypatch):
+    from types import SimpleNamespace
+
+    module = ExecutorModule()
+    replies = []
+
+    async def run(code):
+        return {"output": "&" * 5000}
+
+    async def reply(text, **kwargs):
+        replies.append(text)
+
+    monkeypatch.setattr(module, "_run_in_piston", run)
+    message = SimpleNamespace(chat=None, reply=reply)
+    monkeypatch.setattr("modules.executor.router.language_from_message", lambda _: "en")
+
+    asyncio.run(module._execute_code(message, "print('&' * 5000)"))
+
+    output = replies[0].split("<b>Output:</b>\n<pre><code>", 1)[1]
+    assert output == "&amp;" * 1800 + "</code></pre>"
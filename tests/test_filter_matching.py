@@ -0,0 +1,79 @@
+import pytest
+
+from modules.filters import matching
+from modules.filters.matching import RegexMatcher, SubstringMatcher, compile_pattern
+
+
+def test_compile_pattern_is_cached_and_case_insensitive():
+    compiled = compile_pattern(r"hel+o")
+
+    assert compiled is compile_pattern(r"hel+o")
+    assert compiled.search("say HELLO there")
+
+
+def test_invalid_pattern_is_remembered():
+    assert compile_pattern("(unclosed") is None
+    hits = compile_pattern.cache_info().hits
+    assert compile_pattern("(unclosed") is None
+    assert compile_pattern.cache_info().hits == hits + 1
+
+
+@pytest.mark.parametrize("use_automaton", [True, False])
+def test_substring_matcher_reports_first_occurrence_in_definition_order(
+    monkeypatch, use_automaton
+):
+    if not use_automaton:
+        monkeypatch.setattr(matching, "ahocorasick", None)
+    elif matching.ahocorasick is None:
+        pytest.skip("pyahocorasick is not installed")
+
+    matcher = SubstringMatcher([("hello", "Hello"), ("cat", "cat"), ("dog", "dog")])
+
+    assert matcher.find("a cat says hello to the cat") == [
+        ("hello", "Hello", 16),
+        ("cat", "cat", 5),
+    ]
+    assert matcher.find("nothing here") == []
+    assert SubstringMatcher([]).find("hello") == []
+
+
+@pytest.mark.parametrize("use_automaton", [True, False])
+def test_substring_matcher_keeps_the_first_duplicate_trigger(monkeypatch, use_automaton):
+    if not use_automaton:
+        monkeypatch.setattr(matching, "ahocorasick", None)
+    elif matching.ahocorasick is None:
+        pytest.skip("pyahocorasick is not installed")
+
+    matcher = SubstringMatcher([("hello", "Hello"), ("hello", "hello")])
+
+    assert matcher.find("say hello") == [("hello", "Hello", 9)]
+
+
+def test_regex_matcher_keeps_per_pattern_results():
+    matcher = RegexMatcher(
+        [
+            ("regex::hel+o", r"hel+o"),
+            ("regex::(a)\\1", r"(a)\1"),
+            ("regex::(?i)dog", r"(?i)dog"),
+            ("regex::cat", "cat"),
+            ("regex::(broken", "(broken"),
+        ]
+    )
+
+    assert matcher.find("HELLO cat") == [
+        ("regex::hel+o", r"hel+o", 5),
+        ("regex::cat", "cat", 9),
+    ]
+    assert matcher.find("baa dog") == [
+        ("regex::(a)\\1", r"(a)\1", 3),
+        ("regex::(?i)dog", r"(?i)dog", 7),
+    ]
+    assert matcher.find("nothing") == []
+
+
+def test_substring_matcher_skips_texts_without_trigger_characters(monkeypatch):
+    monkeypatch.setattr(matching, "ahocorasick", None)
+    matcher = SubstringMatcher([("hello", "hello"), ("bye", "bye")])
+
+    assert matcher.find("xyz") == []
+    assert matcher.find("oh, bye") == [("bye", "bye", 7)]
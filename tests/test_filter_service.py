@@ -0,0 +1,69 @@
+import asyncio
+
+from aiogram.types import Chat, Message
+
+from modules.filters.router import FilterService
+from modules.filters.storage import MATCH_TYPE_REGEX
+from utils.path_utils import set_home_dir
+
+
+def _add(service, trigger, match_type="contains"):
+    service.storage.add_template(
+        chat_id=5,
+        trigger=trigger,
+        text=f"reply to {trigger}",
+        entities=None,
+        media_type=None,
+        file_id=None,
+        match_type=match_type,
+    )
+
+
+def test_each_trigger_answers_once_with_its_argument(tmp_path, monkeypatch):
+    set_home_dir(tmp_path)
+    service = FilterService()
+    _add(service, "Hello")
+    _add(service, "hello")
+    _add(service, r"bye+", MATCH_TYPE_REGEX)
+    sent = []
+
+    async def fake_send(message, template, entities, *, argument=None, **_kwargs):
+        sent.append((template.pattern.lower(), argument))
+
+    monkeypatch.setattr(service, "send_template_response", fake_send)
+    message = Message.model_construct(
+        message_id=1,
+        text="hello world, byeee now, hello again",
+        chat=Chat.model_construct(id=5, type="group"),
+    )
+
+    asyncio.run(service.handle_trigger_message(message))
+
+    assert sorted(sent) == [
+        ("bye+", "now, hello again"),
+        ("hello", "world, byeee now, hello again"),
+    ]
+
+
+def test_replies_follow_definition_order_across_match_types(tmp_path, monkeypatch):
+    set_home_dir(tmp_path)
+    service = FilterService()
+    _add(service, "zebra")
+    _add(service, r"hel+o", MATCH_TYPE_REGEX)
+    _add(service, "apple")
+    sent = []
+
+    async def fake_send(message, template, *_args, **_kwargs):
+        sent.append(template.pattern.lower())
+
+    monkeypatch.setattr(service, "send_template_response", fake_send)
+    message = Message.model_construct(
+        message_id=1, text="zebra hello apple", chat=Chat.model_construct(id=5, type="group")
+    )
+
+    asyncio.run(service.handle_trigger_message(message))
+
+    # Definitions are listed by trigger key, so the regex sits between the substrings.
+    expected = [pattern for _key, pattern, _type in service.storage.get_filter_definitions(5)]
+    assert expected == ["apple", "hel+o", "zebra"]
+    assert sent == expected
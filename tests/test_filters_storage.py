@@ -75,3 +75,41 @@ def test_event_trigger_is_normalised(tmp_path):
 
     definitions = storage.list_filter_definitions(1)
     assert definitions == [("event::user_joined", "user_joined", MATCH_TYPE_EVENT)]
+
+
+def test_substring_matcher_is_rebuilt_after_writes(tmp_path):
+    set_home_dir(tmp_path)
+    storage = FilterStorage(db_name="test_filters.db")
+    storage.add_template(
+        chat_id=7, trigger="Hello", text="hi", entities=None, media_type=None, file_id=None
+    )
+
+    matcher = storage.get_substring_matcher(7)
+    assert storage.get_substring_matcher(7) is matcher
+    assert [hit[0] for hit in matcher.find("hello there")] == ["hello"]
+
+    storage.add_template(
+        chat_id=7, trigger="there", text="hi", entities=None, media_type=None, file_id=None
+    )
+    matcher = storage.get_substring_matcher(7)
+    assert sorted(hit[0] for hit in matcher.find("hello there")) == ["hello", "there"]
+
+    storage.clear_trigger(7, "hello")
+    assert [hit[0] for hit in storage.get_substring_matcher(7).find("hello there")] == [
+        "there"
+    ]
+
+
+def test_filter_definitions_are_cached_until_a_write(tmp_path):
+    set_home_dir(tmp_path)
+    storage = FilterStorage(db_name="test_filters.db")
+    storage.add_template(
+        chat_id=9, trigger="hello", text="hi", entities=None, media_type=None, file_id=None
+    )
+
+    definitions = storage.get_filter_definitions(9)
+    assert definitions == (("hello", "hello", "contains"),)
+    assert storage.get_filter_definitions(9) is definitions
+
+    storage.remove_template(9, "hello", 1)
+    assert storage.get_filter_definitions(9) == ()
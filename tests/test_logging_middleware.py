@@ -0,0 +1,19 @@
+import functools
+
+from middleware.logging_middleware import LoggingMiddleware
+
+
+class _NextMiddleware:
+    async def __call__(self, handler, event, data):
+        return None
+
+
+async def _handler(event, data):
+    return None
+
+
+def test_handler_name_for_chained_middleware_and_plain_handler():
+    chained = functools.partial(_NextMiddleware(), _handler)
+
+    assert LoggingMiddleware._handler_name(chained) == "_NextMiddleware"
+    assert LoggingMiddleware._handler_name(_handler) == "_handler"
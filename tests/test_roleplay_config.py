@@ -0,0 +1,15 @@
+from modules.roleplay import router as roleplay_router
+
+
+def test_first_char_set_follows_command_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(roleplay_router, "CONFIG_FILE", str(tmp_path / "rp_config.json"))
+    config = roleplay_router.RPConfig()
+
+    assert config.first_char_set(1) == frozenset({"о", "у"})
+
+    config.add_command(1, "Кусь", "укусил", "😬")
+    assert config.first_char_set(1) == frozenset({"о", "у", "к"})
+    assert config.first_char_set(2) == frozenset({"о", "у"})
+
+    config.del_command(1, "кусь")
+    assert config.first_char_set(1) == frozenset({"о", "у"})
@@ -0,0 +1,41 @@
+import asyncio
+
+from middleware.roleplay_middleware import RoleplayMiddleware
+
+
+class _FakeMessage:
+    reply_to_message = None
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        async def record(*args, **kwargs):
+            self.calls.append((name, args, kwargs.get("caption")))
+
+        return record
+
+
+def _send(media):
+    message = _FakeMessage()
+    asyncio.run(RoleplayMiddleware(config=object())._send_media_response(message, media, "hug"))
+    return message.calls
+
+
+def test_media_response_dispatches_by_type():
+    assert _send({"type": "video", "file_id": "v1"}) == [("reply_video", ("v1",), "hug")]
+    assert _send({"type": "sticker", "file_id": "s1"}) == [
+        ("reply_sticker", ("s1",), None),
+        ("reply", ("hug",), None),
+    ]
+    assert _send({"type": "photo"}) == [("reply", ("hug",), None)]
+    assert _send({}) == [("reply", ("hug",), None)]
+
+
+def test_split_command_strips_keyword_punctuation_once():
+    split = RoleplayMiddleware(config=object())._split_command_and_remainder
+
+    assert split("!обнять!! @pug") == ("обнять", "@pug")
+    assert split("обнять") == ("обнять", None)
+    assert split("?!") == (None, None)
+    assert split("") == (None, None)
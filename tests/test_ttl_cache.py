@@ -0,0 +1,42 @@
+from utils.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = TTLCache(ttl=60, clock=clock)
+    cache.set((1, 2), "administrator")
+
+    clock.now = 59.9
+    assert cache.get((1, 2)) == "administrator"
+
+    clock.now = 60.0
+    assert cache.get((1, 2)) is None
+    assert len(cache) == 0
+
+
+def test_oldest_entry_is_evicted_when_full():
+    cache = TTLCache(ttl=60, maxsize=2, clock=FakeClock())
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("a", 3)
+    cache.set("c", 4)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 3
+    assert cache.get("c") == 4
+
+
+def test_pop_removes_entry():
+    cache = TTLCache(ttl=60, clock=FakeClock())
+    cache.set("a", 1)
+
+    assert cache.pop("a") == 1
+    assert cache.pop("a", "missing") == "missing"
@@ -20,7 +20,7 @@ class ChatFeature(str, Enum):
     EXECUTOR = "executor"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ChatRestriction:
     chat_id: int
     feature: ChatFeature
@@ -30,9 +30,11 @@ class BotSettings:
     bot_token: str
     gemini_token: str
     log_level: str = "INFO"
+    faulthandler: bool = True
 
 
 REQUIRED_ENVIRONMENT_VARIABLES: tuple[str, ...] = ("BOT_TOKEN",)
+FALSE_VALUES = frozenset({"0", "false", "no", "off"})
 
 
 def _load_env_file() -> None:
@@ -50,6 +52,13 @@ def _missing_variables(required: Iterable[str]) -> list[str]:
     return [name for name in required if not os.getenv(name)]
 
 
+def _env_flag(name: str, default: bool) -> bool:
+    value = os.getenv(name, "").strip()
+    if not value:
+        return default
+    return value.lower() not in FALSE_VALUES
+
+
 def load_settings() -> BotSettings:
     """Load settings from the environment and ensure required values exist."""
 
@@ -64,5 +73,6 @@ def load_settings() -> BotSettings:
         bot_token=os.environ["BOT_TOKEN"],
         log_level=os.getenv("LOG_LEVEL", "INFO"),
         gemini_token=os.getenv("GEMINI_API_KEY", ""),
+        faulthandler=_env_flag("FAULTHANDLER", True),
     )
 
@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+import copy
 import json
 import logging
 import logging.config
+import logging.handlers
+import queue
 from datetime import datetime
 from pathlib import Path
 
@@ -29,8 +32,24 @@ class JsonFormatter(logging.Formatter):
         return json.dumps(base, ensure_ascii=False)
 
 
-def configure_logging(log_dir: Path, *, level: str = "INFO") -> None:
-    """Configure the logging subsystem with structured and human-readable outputs."""
+class _InProcessQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that keeps ``exc_info`` since records never leave the process."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args eagerly so later mutation of the arguments cannot leak into the log.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def configure_logging(log_dir: Path, *, level: str = "INFO") -> logging.handlers.QueueListener:
+    """Configure the logging subsystem with structured and human-readable outputs.
+
+    The configured handlers are moved behind a ``QueueListener`` so console and
+    file I/O happen on a background thread instead of the event loop. The
+    returned listener is already started; call ``stop()`` on shutdown.
+    """
 
     log_dir.mkdir(parents=True, exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
@@ -67,6 +86,7 @@ def configure_logging(log_dir: Path, *, level: str = "INFO") -> None:
                     "maxBytes": 5 * 1024 * 1024,
                     "backupCount": 5,
                     "encoding": "utf-8",
+                    "delay": True,
                     "level": "DEBUG",
                 },
                 "latest": {
@@ -75,6 +95,7 @@ def configure_logging(log_dir: Path, *, level: str = "INFO") -> None:
                     "filename": str(latest_log_path),
                     "mode": "w",
                     "encoding": "utf-8",
+                    "delay": True,
                     "level": "DEBUG",
                 },
                 "json": {
@@ -84,6 +105,7 @@ def configure_logging(log_dir: Path, *, level: str = "INFO") -> None:
                     "maxBytes": 5 * 1024 * 1024,
                     "backupCount": 3,
                     "encoding": "utf-8",
+                    "delay": True,
                     "level": "INFO",
                 },
             },
@@ -94,10 +116,19 @@ def configure_logging(log_dir: Path, *, level: str = "INFO") -> None:
         }
     )
 
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    for handler in handlers:
+        root.removeHandler(handler)
+    root.addHandler(_InProcessQueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+
     logging.getLogger(__name__).debug(
         "Logging configured: text=%s latest=%s json=%s",
         text_log_path,
         latest_log_path,
         json_log_path,
     )
-
+    return listener
@@ -10,13 +10,13 @@ from time import monotonic
 from typing import Deque, Dict, Optional
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RateLimitConfig:
     limit: int
     window: timedelta
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RateLimitResult:
     allowed: bool
     retry_after: Optional[float]
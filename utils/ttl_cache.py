@@ -0,0 +1,63 @@
+"""Bounded in-memory cache with per-entry expiry."""
+
+from __future__ import annotations
+
+from time import monotonic
+from typing import Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Mapping whose entries expire ``ttl`` seconds after they were stored.
+
+    When ``maxsize`` is reached the oldest entry is evicted first. The cache is
+    meant for the single-threaded event loop and does no locking.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        maxsize: int = 10_000,
+        *,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._clock = clock
+        self._entries: Dict[K, Tuple[float, V]] = {}
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return default
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        entries = self._entries
+        # Re-inserting moves the key to the end so eviction stays oldest-first.
+        entries.pop(key, None)
+        if len(entries) >= self.maxsize:
+            del entries[next(iter(entries))]
+        entries[key] = (self._clock() + self.ttl, value)
+
+    def pop(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        entry = self._entries.pop(key, None)
+        if entry is None or entry[0] <= self._clock():
+            return default
+        return entry[1]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+__all__ = ["TTLCache"]